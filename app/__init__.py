@@ -19,8 +19,38 @@ def create_app(config_class=Config):
     db.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
-    socketio.init_app(app, cors_allowed_origins="*")
-    
+    socketio.init_app(
+        app,
+        cors_allowed_origins="*",
+        max_http_buffer_size=app.config.get('SOCKETIO_MAX_HTTP_BUFFER_SIZE', app.config['MAX_UPLOAD_SIZE']),
+        # Lets emits from any worker (including background tasks) reach clients connected elsewhere
+        message_queue=app.config.get('SOCKETIO_MESSAGE_QUEUE')
+    )
+
+    # Interview session state shared across workers
+    from app.services.session_store import init_session_store
+    init_session_store(app)
+
+    # Shared OpenAI client (connection pool + per-model concurrency limits)
+    from app.services.ai_client import init_openai_registry
+    init_openai_registry(app)
+
+    # Priority admission, rate-limit pacing and retries for OpenAI calls
+    from app.services.llm_scheduler import init_llm_scheduler
+    init_llm_scheduler(app)
+
+    # Duplicate slow live-interview calls to cut tail latency (opt-in)
+    from app.services.hedging import init_hedger
+    init_hedger(app)
+
+    # Cached AI prompts (invalidated through the shared prompt version)
+    from app.services.prompt_registry import init_prompt_registry
+    init_prompt_registry(app)
+
+    # Memoized LLM results keyed by prompt version, model and inputs
+    from app.services.llm_cache import init_llm_cache
+    init_llm_cache(app)
+
     # Login manager settings
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Please log in to access this page.'
@@ -31,6 +61,14 @@ def create_app(config_class=Config):
         folder_path = os.path.join(upload_base, folder)
         os.makedirs(folder_path, exist_ok=True)
     
+    # Question audio cache (content-addressed by text/model/voice/format)
+    from app.services.tts_cache import init_tts_cache
+    init_tts_cache(app)
+    
+    # Worker processes for answer transcoding (bounded queue, rejects when saturated)
+    from app.services.audio_pool import init_audio_pool
+    init_audio_pool(app)
+    
     # Register blueprints
     from app.routes.auth import auth_bp
     from app.routes.super_admin import super_admin_bp
@@ -11,7 +11,101 @@ class Config:
     
     # OpenAI Configuration
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
-    
+
+    # OpenAI connection pool (shared client per process)
+    OPENAI_HTTP2 = os.environ.get('OPENAI_HTTP2', 'True').lower() == 'true'
+    OPENAI_MAX_CONNECTIONS = int(os.environ.get('OPENAI_MAX_CONNECTIONS', 50))
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get('OPENAI_MAX_KEEPALIVE_CONNECTIONS', 20))
+    OPENAI_KEEPALIVE_EXPIRY = float(os.environ.get('OPENAI_KEEPALIVE_EXPIRY', 30))
+    OPENAI_TIMEOUT = float(os.environ.get('OPENAI_TIMEOUT', 60))
+    OPENAI_CONNECT_TIMEOUT = float(os.environ.get('OPENAI_CONNECT_TIMEOUT', 5))
+    OPENAI_MAX_RETRIES = int(os.environ.get('OPENAI_MAX_RETRIES', 2))
+    # Max in-flight calls per model, e.g. "whisper-1:8,tts-1-hd:6,gpt-4o-mini:12"
+    OPENAI_MODEL_CONCURRENCY = os.environ.get('OPENAI_MODEL_CONCURRENCY', '')
+    OPENAI_DEFAULT_MODEL_CONCURRENCY = int(os.environ.get('OPENAI_DEFAULT_MODEL_CONCURRENCY', 8))
+    OPENAI_SLOT_TIMEOUT = float(os.environ.get('OPENAI_SLOT_TIMEOUT', 30))
+
+    # LLM request scheduler: per-model pacing used until rate-limit headers arrive, the share of
+    # each bucket background calls leave free for live interview calls, and retry backoff
+    LLM_DEFAULT_RPM = int(os.environ.get('LLM_DEFAULT_RPM', 500))
+    LLM_DEFAULT_TPM = int(os.environ.get('LLM_DEFAULT_TPM', 200000))
+    LLM_LIVE_RESERVE = float(os.environ.get('LLM_LIVE_RESERVE', 0.2))
+    LLM_QUEUE_TIMEOUT = float(os.environ.get('LLM_QUEUE_TIMEOUT', 60))
+    LLM_LIVE_MAX_RETRIES = int(os.environ.get('LLM_LIVE_MAX_RETRIES', 2))
+    LLM_BACKGROUND_MAX_RETRIES = int(os.environ.get('LLM_BACKGROUND_MAX_RETRIES', 5))
+    LLM_BACKOFF_BASE = float(os.environ.get('LLM_BACKOFF_BASE', 0.5))
+    LLM_LIVE_BACKOFF_CAP = float(os.environ.get('LLM_LIVE_BACKOFF_CAP', 4))
+    LLM_BACKOFF_CAP = float(os.environ.get('LLM_BACKOFF_CAP', 30))
+
+    # Hedged requests (opt-in): a duplicate is sent once a call exceeds HEDGE_PERCENTILE of its
+    # recent latencies, optionally to a faster model, e.g. "evaluate_answer:gpt-4o-mini,generate_speech:tts-1"
+    HEDGE_ENABLED = os.environ.get('HEDGE_ENABLED', 'False').lower() == 'true'
+    HEDGE_CALLS = os.environ.get('HEDGE_CALLS', 'evaluate_answer,generate_speech')
+    HEDGE_FALLBACK_MODELS = os.environ.get('HEDGE_FALLBACK_MODELS', '')
+    HEDGE_PERCENTILE = float(os.environ.get('HEDGE_PERCENTILE', 95))
+    HEDGE_MIN_SAMPLES = int(os.environ.get('HEDGE_MIN_SAMPLES', 20))
+    HEDGE_INITIAL_DELAY = float(os.environ.get('HEDGE_INITIAL_DELAY', 3))
+    HEDGE_MIN_DELAY = float(os.environ.get('HEDGE_MIN_DELAY', 0.5))
+    HEDGE_MAX_RATIO = float(os.environ.get('HEDGE_MAX_RATIO', 0.1))
+    HEDGE_WINDOW = int(os.environ.get('HEDGE_WINDOW', 200))
+
+    # Seconds between checks of the shared AI prompt version
+    PROMPT_CACHE_CHECK_INTERVAL = float(os.environ.get('PROMPT_CACHE_CHECK_INTERVAL', 5))
+
+    # Interview scoring: when enabled, answers are scored in background tasks and
+    # the next question is sent as soon as the answer is stored
+    DEFERRED_SCORING = os.environ.get('DEFERRED_SCORING', 'False').lower() == 'true'
+    DEFERRED_SCORING_TIMEOUT = float(os.environ.get('DEFERRED_SCORING_TIMEOUT', 60))
+
+    # Question speech rendered ahead of time per session (0 disables)
+    TTS_PREFETCH_DEPTH = int(os.environ.get('TTS_PREFETCH_DEPTH', 2))
+    TTS_PREFETCH_WAIT = float(os.environ.get('TTS_PREFETCH_WAIT', 10))
+
+    # On-disk cache of generated question audio (under UPLOAD_FOLDER/tts_cache)
+    TTS_CACHE_ENABLED = os.environ.get('TTS_CACHE_ENABLED', 'True').lower() == 'true'
+    TTS_CACHE_MAX_BYTES = int(os.environ.get('TTS_CACHE_MAX_BYTES', 524288000))  # 500MB default
+
+    # Stream question speech to the browser as speech_chunk/speech_end events
+    TTS_STREAMING = os.environ.get('TTS_STREAMING', 'False').lower() == 'true'
+    TTS_STREAM_CHUNK_SIZE = int(os.environ.get('TTS_STREAM_CHUNK_SIZE', 16384))
+
+    # Rolling transcription of chunked uploads: segment length in seconds (0 disables)
+    TRANSCRIBE_SEGMENT_SECONDS = float(os.environ.get('TRANSCRIBE_SEGMENT_SECONDS', 15))
+    TRANSCRIBE_SEGMENT_TIMEOUT = float(os.environ.get('TRANSCRIBE_SEGMENT_TIMEOUT', 60))
+    # Audio per answer_chunk when the client does not send chunk_ms (matches CHUNK_INTERVAL_MS)
+    ANSWER_CHUNK_SECONDS = float(os.environ.get('ANSWER_CHUNK_SECONDS', 1.0))
+    FFMPEG_BINARY = os.environ.get('FFMPEG_BINARY', 'ffmpeg')
+    # 'pipe' transcodes answers in one ffmpeg process; 'pydub' keeps the older decode/normalize/export path
+    AUDIO_TRANSCODE_MODE = os.environ.get('AUDIO_TRANSCODE_MODE', 'pipe').lower()
+    # Worker processes for answer transcoding (0 runs it inline) and how many jobs may wait for one
+    AUDIO_POOL_WORKERS = int(os.environ.get('AUDIO_POOL_WORKERS', 2))
+    AUDIO_POOL_QUEUE_SIZE = int(os.environ.get('AUDIO_POOL_QUEUE_SIZE', 8))
+    AUDIO_POOL_TIMEOUT = int(os.environ.get('AUDIO_POOL_TIMEOUT', 120))
+    # Seconds the client is told to wait before resubmitting when the pool is saturated
+    AUDIO_POOL_RETRY_AFTER = int(os.environ.get('AUDIO_POOL_RETRY_AFTER', 5))
+
+    # Fast-path scoring rules (per job via Job.fast_path_scoring): score ratios of the question weightage
+    FAST_PATH_YES_RATIO = float(os.environ.get('FAST_PATH_YES_RATIO', 0.9))
+    FAST_PATH_NO_RATIO = float(os.environ.get('FAST_PATH_NO_RATIO', 0.3))
+    FAST_PATH_SHORT_RATIO = float(os.environ.get('FAST_PATH_SHORT_RATIO', 0.1))
+    FAST_PATH_MIN_WORDS = int(os.environ.get('FAST_PATH_MIN_WORDS', 3))
+
+    # CV text extraction stops after this many characters (prompt inputs are then fitted to token budgets)
+    CV_TEXT_MAX_CHARS = int(os.environ.get('CV_TEXT_MAX_CHARS', 12000))
+    PDF_SLOW_PAGE_SECONDS = float(os.environ.get('PDF_SLOW_PAGE_SECONDS', 1.0))
+
+    # BM25 parameters for the local CV/job keyword match
+    LEXICAL_MATCH_K1 = float(os.environ.get('LEXICAL_MATCH_K1', 1.5))
+    LEXICAL_MATCH_B = float(os.environ.get('LEXICAL_MATCH_B', 0.75))
+
+    # LLM result memoization (in-process LRU in front of the llm_cache_entries table)
+    LLM_CACHE_ENABLED = os.environ.get('LLM_CACHE_ENABLED', 'True').lower() == 'true'
+    LLM_CACHE_DB_ENABLED = os.environ.get('LLM_CACHE_DB_ENABLED', 'True').lower() == 'true'
+    LLM_CACHE_MEMORY_SIZE = int(os.environ.get('LLM_CACHE_MEMORY_SIZE', 1024))
+    LLM_CACHE_DEFAULT_TTL = int(os.environ.get('LLM_CACHE_DEFAULT_TTL', 86400))  # 1 day
+    # Per-function TTL overrides in seconds, e.g. "evaluate_answer:604800,personality_profile:0" (0 disables)
+    LLM_CACHE_TTLS = os.environ.get('LLM_CACHE_TTLS', 'analyze_cv:2592000,evaluate_answer:604800')
+
     # SMTP Configuration
     SMTP_HOST = os.environ.get('SMTP_HOST', 'mail.saascon.ae')
     SMTP_PORT = int(os.environ.get('SMTP_PORT', 465))
@@ -25,6 +119,13 @@ class Config:
     # File Upload Configuration
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', './app/static/uploads')
     MAX_UPLOAD_SIZE = int(os.environ.get('MAX_UPLOAD_SIZE', 10485760))  # 10MB default
+    # Largest single Socket.IO message (answer audio arrives in one message)
+    SOCKETIO_MAX_HTTP_BUFFER_SIZE = int(os.environ.get('SOCKETIO_MAX_HTTP_BUFFER_SIZE', MAX_UPLOAD_SIZE))
+    # Message queue shared by all Socket.IO workers/nodes (e.g. redis://localhost:6379/0); unset for a single worker
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE') or None
+    # Interview session state: memory:// (single worker), fakeredis:// (tests) or a redis:// URL
+    SESSION_STORE_URL = os.environ.get('SESSION_STORE_URL', 'memory://')
+    INTERVIEW_SESSION_TTL = int(os.environ.get('INTERVIEW_SESSION_TTL', 10800))  # 3 hours
     def _split_env_list(var_name, default):
         value = os.environ.get(var_name, default)
         return [item.strip().lower() for item in value.split(',') if item.strip()]
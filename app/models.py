@@ -57,6 +57,8 @@ class Job(db.Model):
     title = db.Column(db.String(255), nullable=False)
     description_html = db.Column(db.Text)
     status = db.Column(db.String(20), default='draft')  # draft, published, ended
+    scoring_mode = db.Column(db.String(20), default='live')  # live, batch
+    fast_path_scoring = db.Column(db.Boolean, default=False)  # Score trivial answers with local rules (opt-in)
     organization_id = db.Column(db.Integer, db.ForeignKey('organizations.id'), nullable=False)
     public_url_slug = db.Column(db.String(255), unique=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -96,8 +98,12 @@ class Candidate(db.Model):
     email = db.Column(db.String(255), nullable=False)
     phone = db.Column(db.String(50))
     cv_path = db.Column(db.String(500))
+    cv_hash = db.Column(db.String(64), index=True)  # SHA-256 of the uploaded CV file
+    cv_text = db.Column(db.Text)  # Text extracted from the CV, reused for identical uploads
     cv_summary = db.Column(db.Text)
     matching_percentage = db.Column(db.Float)
+    lexical_match_score = db.Column(db.Float)  # Local BM25 CV/job match (0-100)
+    cv_analysis_status = db.Column(db.String(20), default='completed')  # pending, completed, failed
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -140,6 +146,8 @@ class Answer(db.Model):
     score = db.Column(db.Float, default=0.0)
     weightage = db.Column(db.Integer, default=10)
     duration = db.Column(db.Float)  # Duration in seconds
+    score_status = db.Column(db.String(20), default='scored')  # pending, scoring, scored
+    score_tier = db.Column(db.String(20))  # rule, llm, llm_batch, default, skipped
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def __repr__(self):
@@ -156,6 +164,7 @@ class AIPrompt(db.Model):
     prompt_template = db.Column(db.Text, nullable=False)  # The actual prompt with placeholders
     model = db.Column(db.String(50), default='gpt-3.5-turbo')  # AI model to use
     temperature = db.Column(db.Float, default=0.5)  # Temperature setting
+    token_budgets = db.Column(db.Text)  # JSON {field: max tokens}, e.g. {"cv_text": 1200}
     category = db.Column(db.String(50))  # e.g., 'question_generation', 'evaluation', 'analysis'
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -164,3 +173,40 @@ class AIPrompt(db.Model):
     def __repr__(self):
         return f'<AIPrompt {self.key}>'
 
+
+class AIPromptVersion(db.Model):
+    __tablename__ = 'ai_prompt_versions'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)  # Bumped on every prompt change
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<AIPromptVersion {self.version}>'
+
+
+class LLMCacheEntry(db.Model):
+    __tablename__ = 'llm_cache_entries'
+    
+    key = db.Column(db.String(64), primary_key=True)  # sha256 of function, prompt signature and inputs
+    function = db.Column(db.String(100), nullable=False, index=True)
+    value = db.Column(db.Text, nullable=False)  # JSON-encoded result
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<LLMCacheEntry {self.function} {self.key[:8]}>'
+
+
+class SearchDocument(db.Model):
+    __tablename__ = 'search_documents'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    organization_id = db.Column(db.Integer, db.ForeignKey('organizations.id'), nullable=False, index=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id', ondelete='CASCADE'), nullable=False, unique=True)
+    # CV summary, answers, personality profile and transcript; PostgreSQL adds a GIN full-text index on it
+    content = db.Column(db.Text, nullable=False, default='')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SearchDocument application={self.application_id}>'
@@ -19,6 +19,27 @@ def require_api_key(f):
         return f(*args, **kwargs)
     return decorated_function
 
+@api_bp.route('/metrics', methods=['GET'])
+@require_api_key
+def get_metrics():
+    """Runtime counters for this worker process"""
+    from app.services.tts_cache import get_tts_cache
+    from app.services.llm_cache import get_llm_cache
+    from app.services.llm_scheduler import get_llm_scheduler
+    from app.services.hedging import get_hedger
+    
+    audio_pool = current_app.extensions.get('audio_pool')
+    tts_cache = get_tts_cache()
+    llm_cache = get_llm_cache()
+    
+    return jsonify({
+        'audio_pool': audio_pool.stats() if audio_pool else None,
+        'tts_cache': tts_cache.stats() if tts_cache else None,
+        'llm_cache': llm_cache.stats() if llm_cache else None,
+        'llm_scheduler': get_llm_scheduler().stats(),
+        'hedging': get_hedger().stats()
+    })
+
 @api_bp.route('/organizations', methods=['GET'])
 @require_api_key
 def get_organizations():
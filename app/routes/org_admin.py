@@ -3,7 +3,7 @@ from flask_login import login_required, current_user
 from app import db
 from app.models import Job, Question, Application, Candidate, Answer, User
 from app.utils.auth import org_admin_required, generate_slug, generate_password
-from app.services.ai_service import generate_questions_from_description
+from app.services.ai_service import generate_questions_from_description, invalidate_speech
 from app.services.email_service import send_user_invitation_email
 from datetime import datetime
 from math import ceil
@@ -108,12 +108,17 @@ def edit_job(job_id):
         job.title = request.form.get('title')
         job.description_html = request.form.get('description')
         status = request.form.get('status')
+        scoring_mode = request.form.get('scoring_mode')
         
         if status and status in ['draft', 'published', 'ended']:
             job.status = status
             if status == 'published' and not job.published_at:
                 job.published_at = datetime.utcnow()
         
+        if scoring_mode in ['live', 'batch']:
+            job.scoring_mode = scoring_mode
+        job.fast_path_scoring = request.form.get('fast_path_scoring') == 'on'
+        
         db.session.commit()
         flash('Job updated successfully', 'success')
         return redirect(url_for('org_admin.edit_job', job_id=job.id))
@@ -197,11 +202,16 @@ def edit_question(question_id):
         Job.organization_id == current_user.organization_id
     ).first_or_404()
     
+    old_text = question.text
     question.text = request.form.get('text')
     question.weightage = request.form.get('weightage', type=int)
     
     db.session.commit()
     
+    # Cached question audio is keyed by text, so drop the stale recording
+    if question.text != old_text:
+        invalidate_speech(old_text)
+    
     return jsonify({'success': True})
 
 @org_admin_bp.route('/questions/<int:question_id>/delete', methods=['POST'])
@@ -214,8 +224,10 @@ def delete_question(question_id):
     ).first_or_404()
     
     job_id = question.job_id
+    question_text = question.text
     db.session.delete(question)
     db.session.commit()
+    invalidate_speech(question_text)
     
     flash('Question deleted successfully', 'success')
     return redirect(url_for('org_admin.edit_job', job_id=job_id))
@@ -416,6 +428,57 @@ def view_application(application_id):
                          application=application,
                          answers=answers)
 
+@org_admin_bp.route('/search')
+@login_required
+@org_admin_required
+def search_applications():
+    from app.services.search_service import search_applications as run_search
+    
+    query = (request.args.get('q') or '').strip()
+    page = max(request.args.get('page', 1, type=int) or 1, 1)
+    per_page = 20
+    
+    results, total = run_search(current_user.organization_id, query, page, per_page)
+    pages = ceil(total / per_page) if total else 0
+    
+    return render_template('org_admin/search.html',
+                         query=query,
+                         results=results,
+                         total=total,
+                         page=page,
+                         pages=pages,
+                         per_page=per_page)
+
+@org_admin_bp.route('/jobs/<int:job_id>/rerank', methods=['POST'])
+@login_required
+@org_admin_required
+def rerank_applicants(job_id):
+    job = Job.query.filter_by(
+        id=job_id,
+        organization_id=current_user.organization_id
+    ).first_or_404()
+    
+    from app.services.matching_service import rerank_job_applicants
+    
+    count = rerank_job_applicants(job.id)
+    flash(f'Keyword match recalculated for {count} applicant(s)', 'success')
+    return redirect(url_for('org_admin.applications', job_id=job.id))
+
+@org_admin_bp.route('/applications/<int:application_id>/reanalyze-cv', methods=['POST'])
+@login_required
+@org_admin_required
+def reanalyze_cv(application_id):
+    application = Application.query.join(Job).filter(
+        Application.id == application_id,
+        Job.organization_id == current_user.organization_id
+    ).first_or_404()
+    
+    from app.services.cv_analysis_service import schedule_cv_analysis
+    
+    schedule_cv_analysis(application.candidate, application.job)
+    flash('CV analysis has been queued', 'success')
+    return redirect(url_for('org_admin.view_application', application_id=application_id))
+
 @org_admin_bp.route('/applications/<int:application_id>/download-pdf')
 @login_required
 @org_admin_required
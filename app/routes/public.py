@@ -1,9 +1,10 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, session, current_app
 from app import db
 from app.models import Organization, Job, Candidate, Application, Question, Answer, User
-from app.utils.validators import save_uploaded_file
+from app.utils.validators import save_uploaded_file, save_fingerprinted_file
 from app.utils.auth import generate_password, generate_slug
-from app.services.ai_service import analyze_cv, evaluate_answer
+from app.services.ai_service import evaluate_answer
+from app.services.cv_analysis_service import PENDING_SUMMARY, schedule_cv_analysis
 from app.services.email_service import send_invitation_email
 from datetime import datetime
 
@@ -165,12 +166,13 @@ def apply_job(org_slug, job_slug):
         if client_ip and ',' in client_ip:
             client_ip = client_ip.split(',')[0].strip()
         
-        # Handle CV upload
+        # Handle CV upload (stored once per content hash)
         cv_path = None
+        cv_hash = None
         if 'cv' in request.files:
             cv = request.files['cv']
             if cv.filename != '':
-                cv_path, error = save_uploaded_file(cv, 'cv')
+                cv_path, cv_hash, error = save_fingerprinted_file(cv, 'cv')
                 if error:
                     flash(error, 'danger')
                     return redirect(url_for('public.apply_job', org_slug=org_slug, job_slug=job_slug))
@@ -179,32 +181,6 @@ def apply_job(org_slug, job_slug):
             flash('CV upload is required', 'danger')
             return redirect(url_for('public.apply_job', org_slug=org_slug, job_slug=job_slug))
         
-        def _clean_matching_percentage(value):
-            """Ensure we persist a numeric matching percentage (0-100)."""
-            if value is None:
-                return 0.0
-            if isinstance(value, (int, float)):
-                return max(0.0, min(float(value), 100.0))
-            if isinstance(value, str):
-                import re
-                match = re.search(r'-?\d+(\.\d+)?', value)
-                if match:
-                    try:
-                        return max(0.0, min(float(match.group()), 100.0))
-                    except ValueError:
-                        pass
-            return 0.0
-
-        cv_summary = "Analysis pending"
-        matching_percentage = 0.0
-
-        try:
-            cv_analysis = analyze_cv(cv_path, job.description_html)
-            cv_summary = cv_analysis.get('summary', cv_summary)
-            matching_percentage = _clean_matching_percentage(cv_analysis.get('matching_percentage'))
-        except Exception:
-            current_app.logger.exception("CV analysis failed during application submission")
-
         try:
             # Create candidate
             candidate = Candidate(
@@ -213,8 +189,10 @@ def apply_job(org_slug, job_slug):
                 email=email,
                 phone=phone,
                 cv_path=cv_path,
-                cv_summary=cv_summary,
-                matching_percentage=matching_percentage
+                cv_hash=cv_hash,
+                cv_summary=PENDING_SUMMARY,
+                matching_percentage=0.0,
+                cv_analysis_status='pending'
             )
             
             db.session.add(candidate)
@@ -246,6 +224,13 @@ def apply_job(org_slug, job_slug):
             flash(f'We hit an unexpected error while submitting your application. Details: {debug_message}', 'danger')
             return redirect(url_for('public.apply_job', org_slug=org_slug, job_slug=job_slug))
         
+        # CV parsing and the AI match run after the redirect; org admins see the status meanwhile
+        try:
+            schedule_cv_analysis(candidate, job)
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception("Could not schedule CV analysis for candidate %s", candidate.id)
+        
         # Store application ID in session for interview
         session['application_id'] = application.id
         
@@ -5,6 +5,8 @@ from app.models import Organization, User, Job, Application, Candidate, Answer,
 from app.utils.auth import super_admin_required, generate_password, generate_slug
 from app.utils.validators import save_uploaded_file
 from app.services.email_service import send_invitation_email
+from app.services.prompt_registry import bump_prompt_version
+from app.services.prompt_budget import parse_budgets
 from werkzeug.utils import secure_filename
 import os
 import math
@@ -407,6 +409,16 @@ def edit_ai_prompt(prompt_id):
         prompt.category = request.form.get('category')
         prompt.is_active = request.form.get('is_active') == 'on'
         
+        token_budgets = (request.form.get('token_budgets') or '').strip()
+        try:
+            parse_budgets(token_budgets)
+        except ValueError as e:
+            db.session.rollback()
+            flash(f'Invalid token budgets: {e}', 'danger')
+            return redirect(url_for('super_admin.edit_ai_prompt', prompt_id=prompt_id))
+        prompt.token_budgets = token_budgets or None
+        
+        bump_prompt_version()
         db.session.commit()
         flash('AI Prompt updated successfully', 'success')
         return redirect(url_for('super_admin.ai_prompts'))
@@ -426,6 +438,13 @@ def add_ai_prompt():
             flash('A prompt with this key already exists', 'danger')
             return redirect(url_for('super_admin.add_ai_prompt'))
         
+        token_budgets = (request.form.get('token_budgets') or '').strip()
+        try:
+            parse_budgets(token_budgets)
+        except ValueError as e:
+            flash(f'Invalid token budgets: {e}', 'danger')
+            return redirect(url_for('super_admin.add_ai_prompt'))
+        
         prompt = AIPrompt(
             key=key,
             name=request.form.get('name'),
@@ -435,10 +454,12 @@ def add_ai_prompt():
             model=request.form.get('model', 'gpt-3.5-turbo'),
             temperature=float(request.form.get('temperature', 0.5)),
             category=request.form.get('category'),
-            is_active=request.form.get('is_active') == 'on'
+            is_active=request.form.get('is_active') == 'on',
+            token_budgets=token_budgets or None
         )
         
         db.session.add(prompt)
+        bump_prompt_version()
         db.session.commit()
         flash('AI Prompt added successfully', 'success')
         return redirect(url_for('super_admin.ai_prompts'))
@@ -452,6 +473,7 @@ def toggle_ai_prompt(prompt_id):
     """Toggle AI prompt active status"""
     prompt = AIPrompt.query.get_or_404(prompt_id)
     prompt.is_active = not prompt.is_active
+    bump_prompt_version()
     db.session.commit()
     
     status = 'activated' if prompt.is_active else 'deactivated'
@@ -465,6 +487,7 @@ def delete_ai_prompt(prompt_id):
     """Delete an AI prompt"""
     prompt = AIPrompt.query.get_or_404(prompt_id)
     db.session.delete(prompt)
+    bump_prompt_version()
     db.session.commit()
     flash('AI Prompt deleted successfully', 'success')
     return redirect(url_for('super_admin.ai_prompts'))
@@ -0,0 +1,125 @@
+import threading
+from contextlib import contextmanager
+import httpx
+import openai
+from flask import current_app
+
+
+def _parse_model_limits(value):
+    """Parse 'model:limit,model:limit' into a dict"""
+    limits = {}
+    for item in (value or '').split(','):
+        if ':' not in item:
+            continue
+        model, limit = item.rsplit(':', 1)
+        try:
+            limits[model.strip()] = max(1, int(limit))
+        except ValueError:
+            continue
+    return limits
+
+
+class ModelSlotTimeout(Exception):
+    """Raised when no concurrency slot frees up for a model in time"""
+
+
+class OpenAIClientRegistry:
+    """Process-wide OpenAI client with a shared keep-alive pool and per-model limits"""
+
+    def __init__(self, config):
+        self.api_key = config.get('OPENAI_API_KEY')
+        self.http2 = config.get('OPENAI_HTTP2', True)
+        self.max_connections = config.get('OPENAI_MAX_CONNECTIONS', 50)
+        self.max_keepalive = config.get('OPENAI_MAX_KEEPALIVE_CONNECTIONS', 20)
+        self.keepalive_expiry = config.get('OPENAI_KEEPALIVE_EXPIRY', 30.0)
+        self.timeout = config.get('OPENAI_TIMEOUT', 60.0)
+        self.connect_timeout = config.get('OPENAI_CONNECT_TIMEOUT', 5.0)
+        self.max_retries = config.get('OPENAI_MAX_RETRIES', 2)
+        self.default_limit = config.get('OPENAI_DEFAULT_MODEL_CONCURRENCY', 8)
+        self.model_limits = _parse_model_limits(config.get('OPENAI_MODEL_CONCURRENCY', ''))
+        self.slot_timeout = config.get('OPENAI_SLOT_TIMEOUT', 30.0)
+
+        self._client = None
+        self._http_client = None
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _build_http_client(self):
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry
+        )
+        timeout = httpx.Timeout(self.timeout, connect=self.connect_timeout)
+        if self.http2:
+            try:
+                return httpx.Client(http2=True, limits=limits, timeout=timeout)
+            except ImportError:
+                # h2 not installed - keep-alive over HTTP/1.1 still avoids repeat handshakes
+                print("HTTP/2 support unavailable (install h2), using HTTP/1.1 keep-alive")
+        return httpx.Client(limits=limits, timeout=timeout)
+
+    def get_client(self):
+        """Return the shared client, creating it on first use"""
+        if not self.api_key:
+            raise ValueError("OpenAI API key not configured")
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._http_client = self._build_http_client()
+                    self._client = openai.OpenAI(
+                        api_key=self.api_key,
+                        http_client=self._http_client,
+                        timeout=self.timeout,
+                        max_retries=self.max_retries
+                    )
+        return self._client
+
+    def _semaphore(self, model):
+        semaphore = self._semaphores.get(model)
+        if semaphore is None:
+            with self._lock:
+                semaphore = self._semaphores.get(model)
+                if semaphore is None:
+                    limit = self.model_limits.get(model, self.default_limit)
+                    semaphore = threading.BoundedSemaphore(limit)
+                    self._semaphores[model] = semaphore
+        return semaphore
+
+    @contextmanager
+    def model_slot(self, model):
+        """Hold one of the in-flight slots for a model for the duration of a call"""
+        semaphore = self._semaphore(model)
+        if not semaphore.acquire(timeout=self.slot_timeout):
+            raise ModelSlotTimeout(f"No free slot for model {model} after {self.slot_timeout}s")
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def close(self):
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._client = None
+            self._http_client = None
+
+
+def init_openai_registry(app):
+    """Create the app-scoped OpenAI client registry"""
+    registry = OpenAIClientRegistry(app.config)
+    app.extensions['openai_registry'] = registry
+    return registry
+
+
+def get_openai_registry():
+    """Get the registry for the current app, creating it if the app skipped init"""
+    registry = current_app.extensions.get('openai_registry')
+    if registry is None:
+        registry = init_openai_registry(current_app._get_current_object())
+    return registry
+
+
+def model_slot(model):
+    """Shortcut for get_openai_registry().model_slot(model)"""
+    return get_openai_registry().model_slot(model)
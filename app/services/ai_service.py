@@ -1,28 +1,79 @@
-import openai
 from flask import current_app
 import PyPDF2
 import os
 import re
 import json
+import hashlib
+import time
 import traceback
-from app.models import AIPrompt
+from app.services.ai_client import get_openai_registry
+from app.services.hedging import hedged_call
+from app.services.llm_scheduler import PRIORITY_BACKGROUND, PRIORITY_LIVE, get_llm_scheduler
+from app.services.prompt_registry import get_prompt_registry
+from app.services.tts_cache import TTSCache, get_tts_cache
+from app.services.llm_cache import memoize_llm, skip_llm_cache
+from app.services.prompt_budget import budgets_for, count_tokens, fit_inputs, fit_items
+
+# Placeholder answer texts written when there is nothing to evaluate
+NO_ANSWER_TEXT = "[No answer provided]"
+TRANSCRIPTION_FAILED_TEXT = "[Transcription failed]"
+
+# Openers of closed (yes/no) questions, and replies that are nothing but yes or no
+YES_NO_QUESTION_STARTS = (
+    'are', 'is', 'am', 'do', 'does', 'did', 'have', 'has', 'had', 'can', 'could',
+    'will', 'would', 'should', 'shall', 'may', 'were', 'was'
+)
+# A question using any of these ("Can you describe...", "Have you led a team? Tell us how...")
+# asks for more than a yes or no
+REQUEST_VERBS = {
+    'describe', 'tell', 'explain', 'walk', 'share', 'give', 'talk', 'elaborate', 'provide', 'outline',
+    'list', 'discuss', 'summarize', 'summarise', 'name', 'detail', 'expand', 'go', 'take', 'show'
+}
+# Words that turn a yes/no opener into an open question ("Do you prefer remote or office work?")
+OPEN_QUESTION_WORDS = {'what', 'which', 'how', 'why', 'where', 'when', 'who', 'or'}
+# Openers of questions that ask for a narrative answer; only these can be "too short"
+OPEN_ENDED_STARTS = ('describe', 'tell', 'explain', 'walk', 'share', 'discuss', 'elaborate', 'talk')
+AFFIRMATIVE_REPLIES = {'yes', 'yeah', 'yep', 'yup', 'sure', 'of course', 'absolutely', 'definitely', 'correct', 'i do', 'i am', 'i can', 'i have', 'i will'}
+NEGATIVE_REPLIES = {'no', 'nope', 'not really', 'i do not', "i don't", 'i am not', "i'm not", 'i cannot', "i can't", 'i have not', "i haven't", 'i will not', "i won't"}
 
 def get_openai_client():
-    """Get configured OpenAI client"""
-    api_key = current_app.config.get('OPENAI_API_KEY')
-    if not api_key:
-        raise ValueError("OpenAI API key not configured")
-    return openai.OpenAI(api_key=api_key)
+    """Get the shared, connection-pooled OpenAI client"""
+    return get_openai_registry().get_client()
+
+def call_openai(model, request, priority=PRIORITY_BACKGROUND, tokens=0):
+    """
+    Send one OpenAI request through the priority scheduler and return the parsed response.
+    request(client) must go through with_raw_response so rate-limit headers can be read;
+    retries are left to the scheduler.
+    """
+    client = get_openai_client().with_options(max_retries=0)
+    return get_llm_scheduler().call(model, lambda: request(client), priority=priority, tokens=tokens)
+
+def chat_completion(model, system_message, prompt, temperature, priority=PRIORITY_BACKGROUND):
+    """Scheduled chat completion with a system and a user message"""
+    return call_openai(
+        model,
+        lambda client: client.chat.completions.with_raw_response.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature
+        ),
+        priority=priority,
+        tokens=count_tokens(system_message, model) + count_tokens(prompt, model)
+    )
 
 def get_prompt(key, **kwargs):
     """
-    Get AI prompt from database and format with provided kwargs
+    Get AI prompt from the cached prompt registry and format with provided kwargs
     Falls back to default if prompt not found in database
     """
     from app import db
     
     try:
-        prompt_config = AIPrompt.query.filter_by(key=key, is_active=True).first()
+        prompt_config = get_prompt_registry().get(key)
     except Exception as exc:
         current_app.logger.warning("Unable to load AI prompt '%s': %s", key, exc)
         db.session.rollback()
@@ -32,10 +83,14 @@ def get_prompt(key, **kwargs):
         # Return None if not found - caller will handle fallback
         return None
     
-    # Format the prompt template with provided variables
+    if prompt_config.error:
+        print(f"Error parsing prompt {key}: {prompt_config.error}")
+        return None
+    
+    # Format the pre-parsed prompt template with provided variables
     try:
-        prompt = prompt_config.prompt_template.format(**kwargs)
-    except KeyError as e:
+        prompt = prompt_config.render(**kwargs)
+    except (KeyError, IndexError) as e:
         print(f"Error formatting prompt {key}: missing variable {e}")
         return None
     
@@ -46,26 +101,87 @@ def get_prompt(key, **kwargs):
         'temperature': prompt_config.temperature
     }
 
-def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF file"""
+def _prompt_budget_config(key, default_model):
+    """Model and per-field token budgets for a prompt (built-in defaults when it is not in the database)"""
+    from app import db
+    
+    try:
+        prompt_config = get_prompt_registry().get(key)
+    except Exception:
+        db.session.rollback()
+        prompt_config = None
+    if not prompt_config or prompt_config.error:
+        return default_model, budgets_for(key)
+    return prompt_config.model or default_model, budgets_for(key, prompt_config.token_budgets)
+
+def fit_prompt_inputs(key, default_model, **fields):
+    """Compact the text inputs of a prompt and truncate each to its token budget"""
+    model, budgets = _prompt_budget_config(key, default_model)
+    return fit_inputs(key, model=model, prompt_budgets=budgets, **fields)
+
+def iter_pdf_pages(full_path):
+    """Lazily yield (page_number, text, seconds) for each page of a PDF"""
+    with open(full_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page_number, page in enumerate(pdf_reader.pages, start=1):
+            started = time.perf_counter()
+            text = page.extract_text() or ""
+            yield page_number, text, time.perf_counter() - started
+
+def extract_text_from_pdf(pdf_path, max_chars=None):
+    """Extract text from PDF file, stopping once max_chars (CV_TEXT_MAX_CHARS) have been read"""
+    if max_chars is None:
+        max_chars = current_app.config.get('CV_TEXT_MAX_CHARS', 12000)
+    slow_page = current_app.config.get('PDF_SLOW_PAGE_SECONDS', 1.0)
+    
     try:
         # Construct full path
         full_path = os.path.join(current_app.root_path, 'static', pdf_path)
         
-        with open(full_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
+        parts = []
+        length = 0
+        total_seconds = 0.0
+        pages_read = 0
+        for page_number, text, seconds in iter_pdf_pages(full_path):
+            pages_read = page_number
+            total_seconds += seconds
+            if seconds > slow_page:
+                current_app.logger.warning(
+                    "Slow PDF page: %s page %d took %.2fs", pdf_path, page_number, seconds
+                )
+            parts.append(text)
+            length += len(text)
+            if max_chars and length >= max_chars:
+                break  # Later pages would be cut off anyway
         
-        return text
+        current_app.logger.info(
+            "Extracted %d chars from %d page(s) of %s in %.2fs", length, pages_read, pdf_path, total_seconds
+        )
+        text = "".join(parts)
+        return text[:max_chars] if max_chars else text
     except Exception as e:
         print(f"Error extracting PDF text: {e}")
         return ""
 
+def get_cv_text(cv_path, cv_hash=None):
+    """Return a CV's text, reusing the extraction stored for an identical file when there is one"""
+    if cv_hash:
+        from app import db
+        from app.models import Candidate
+        
+        cv_text = db.session.query(Candidate.cv_text).filter(
+            Candidate.cv_hash == cv_hash,
+            Candidate.cv_text.isnot(None),
+            Candidate.cv_text != ''
+        ).limit(1).scalar()
+        if cv_text:
+            return cv_text
+    return extract_text_from_pdf(cv_path)
+
+# Not memoized: every "Generate" click appends a new set of questions to the job
 def generate_questions_from_description(job_description):
     """Generate interview questions from job description using AI"""
-    client = get_openai_client()
+    job_description = fit_prompt_inputs('generate_questions', "gpt-3.5-turbo", job_description=job_description)['job_description']
     
     # Try to get prompt from database
     prompt_config = get_prompt('generate_questions', job_description=job_description)
@@ -100,14 +216,7 @@ Make sure questions are:
         temperature = prompt_config['temperature']
     
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=temperature
-        )
+        response = chat_completion(model, system_message, prompt, temperature, priority=PRIORITY_BACKGROUND)
         
         content = response.choices[0].message.content.strip()
         
@@ -133,28 +242,53 @@ Make sure questions are:
             {"text": "Why are you interested in this role?", "weightage": 10}
         ]
 
-def analyze_cv(cv_path, job_description):
-    """Analyze CV and match with job description"""
+def _cv_cache_inputs(cv_path, job_description, cv_text=None, cv_hash=None):
+    # Key on (CV content hash, job description hash) so re-uploads and re-runs share a result
+    if not cv_hash:
+        full_path = os.path.join(current_app.root_path, 'static', cv_path)
+        digest = hashlib.sha256()
+        with open(full_path, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b''):
+                digest.update(block)
+        cv_hash = digest.hexdigest()
+    description = ' '.join((job_description or '').split())
+    return [cv_hash, hashlib.sha256(description.encode('utf-8')).hexdigest()]
+
+@memoize_llm('analyze_cv', key_inputs=_cv_cache_inputs)
+def analyze_cv(cv_path, job_description, cv_text=None, cv_hash=None):
+    """
+    Analyze CV and match with job description (cv_text skips re-extracting the PDF).
+    Fallback results carry 'failed': True so callers can tell them from a real analysis.
+    """
     try:
-        client = get_openai_client()
+        get_openai_client()
     except Exception as e:
         print(f"AI analysis unavailable: {e}")
+        skip_llm_cache()
         return {
             'summary': 'Analysis pending',
-            'matching_percentage': 0.0
+            'matching_percentage': 0.0,
+            'failed': True
         }
     
     # Extract CV text
-    cv_text = extract_text_from_pdf(cv_path)
+    if cv_text is None:
+        cv_text = get_cv_text(cv_path, cv_hash)
     
     if not cv_text:
+        skip_llm_cache()
         return {
             'summary': 'Unable to extract CV content',
-            'matching_percentage': 0.0
+            'matching_percentage': 0.0,
+            'failed': True
         }
     
+    # Only the budgeted share of the CV and job description is sent to the model
+    fitted = fit_prompt_inputs('analyze_cv', "gpt-3.5-turbo", job_description=job_description, cv_text=cv_text)
+    job_description, cv_excerpt = fitted['job_description'], fitted['cv_text']
+    
     # Try to get prompt from database
-    prompt_config = get_prompt('analyze_cv', job_description=job_description, cv_text=cv_text[:3000])
+    prompt_config = get_prompt('analyze_cv', job_description=job_description, cv_text=cv_excerpt)
     
     # Fallback to default prompt if not in database
     if not prompt_config:
@@ -167,7 +301,7 @@ Job Description:
 {job_description}
 
 Candidate CV:
-{cv_text[:3000]}  # Limit to avoid token limits
+{cv_excerpt}
 
 Return response as JSON:
 {{
@@ -185,14 +319,7 @@ Return response as JSON:
         temperature = prompt_config['temperature']
     
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=temperature
-        )
+        response = chat_completion(model, system_message, prompt, temperature, priority=PRIORITY_BACKGROUND)
         
         content = response.choices[0].message.content.strip()
         
@@ -202,21 +329,77 @@ Return response as JSON:
             result = json.loads(json_match.group())
             return result
         else:
+            skip_llm_cache()
             return {
                 'summary': 'Analysis completed',
-                'matching_percentage': 50.0
+                'matching_percentage': 50.0,
+                'failed': True
             }
             
     except Exception as e:
         print(f"Error analyzing CV: {e}")
+        skip_llm_cache()
         return {
             'summary': 'Error during analysis',
-            'matching_percentage': 0.0
+            'matching_percentage': 0.0,
+            'failed': True
         }
 
+def _question_words(question_text):
+    return re.findall(r"[a-z']+", (question_text or '').lower())
+
+def _is_yes_no_question(question_text):
+    """A single sentence opening like "Are you..." that asks for nothing beyond yes or no"""
+    sentences = [s for s in re.split(r"[.?!]+(?:\s+|$)", (question_text or '').strip()) if s.strip()]
+    words = _question_words(question_text)
+    if len(sentences) != 1 or not words or words[0] not in YES_NO_QUESTION_STARTS:
+        return False
+    return not any(word in REQUEST_VERBS or word in OPEN_QUESTION_WORDS for word in words)
+
+def _is_open_ended_question(question_text):
+    words = _question_words(question_text)
+    return bool(words) and words[0] in OPEN_ENDED_STARTS
+
+def _yes_no_reply(answer_text):
+    """Return 'yes'/'no' when the answer is only an affirmation or negation (repeats allowed)"""
+    phrases = [p.strip() for p in re.split(r"[.,!;]+", (answer_text or '').lower()) if p.strip()]
+    if not phrases:
+        return None
+    for reply, replies in (('yes', AFFIRMATIVE_REPLIES), ('no', NEGATIVE_REPLIES)):
+        # "yes i am" / "no i don't" are a bare reply followed by its echo
+        if all(p in replies or (p.split(' ', 1)[0] in replies and p.split(' ', 1)[-1] in replies) for p in phrases):
+            return reply
+    return None
+
+def fast_path_score(question_text, answer_text, question_weightage):
+    """
+    Score answers that need no LLM judgement with deterministic rules.
+    Returns (score, rule) or None when the answer should go to evaluate_answer.
+    """
+    text = (answer_text or '').strip()
+    if not text or text in (NO_ANSWER_TEXT, TRANSCRIPTION_FAILED_TEXT):
+        return 0.0, 'no_answer'
+    
+    yes_no_question = _is_yes_no_question(question_text)
+    if yes_no_question:
+        reply = _yes_no_reply(text)
+        if reply == 'yes':
+            return question_weightage * current_app.config.get('FAST_PATH_YES_RATIO', 0.9), 'yes_reply'
+        if reply == 'no':
+            return question_weightage * current_app.config.get('FAST_PATH_NO_RATIO', 0.3), 'no_reply'
+        return None
+    
+    # A narrative question ("Describe...", "Tell us about...") answered in a word or two cannot
+    # earn more than a token score; every other question goes to the LLM
+    if _is_open_ended_question(question_text) and len(re.findall(r"\w+", text)) < current_app.config.get('FAST_PATH_MIN_WORDS', 3):
+        return question_weightage * current_app.config.get('FAST_PATH_SHORT_RATIO', 0.1), 'too_short'
+    return None
+
+@memoize_llm('evaluate_answer')
 def evaluate_answer(question_text, answer_text, question_weightage):
     """Evaluate a candidate's answer and assign score"""
-    client = get_openai_client()
+    fitted = fit_prompt_inputs('evaluate_answer', "gpt-4o-mini", question_text=question_text, answer_text=answer_text)
+    question_text, answer_text = fitted['question_text'], fitted['answer_text']
     
     # Try to get prompt from database
     prompt_config = get_prompt('evaluate_answer', question_text=question_text, answer_text=answer_text, question_weightage=question_weightage)
@@ -282,14 +465,14 @@ Return ONLY a valid JSON object with:
         temperature = prompt_config['temperature']
     
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=temperature
+        # The candidate waits on this score, so a slow call may be hedged
+        response, answered_by = hedged_call(
+            'evaluate_answer',
+            model,
+            lambda hedge_model: chat_completion(hedge_model, system_message, prompt, temperature, priority=PRIORITY_LIVE)
         )
+        if answered_by != model:
+            skip_llm_cache()  # Keep the memo keyed to the configured model's answers
         
         content = response.choices[0].message.content.strip()
         
@@ -299,17 +482,109 @@ Return ONLY a valid JSON object with:
             result = json.loads(json_match.group())
             return result.get('score', question_weightage * 0.5)
         else:
+            skip_llm_cache()
             return question_weightage * 0.6  # Default score
             
     except Exception as e:
         print(f"Error evaluating answer: {e}")
+        skip_llm_cache()
         return question_weightage * 0.5  # Return 50% of weightage as default
 
+@memoize_llm('evaluate_answers_batch')
+def evaluate_answers_batch(items):
+    """
+    Score several answers with one chat completion.
+    items: list of dicts with question, answer and weightage.
+    Returns a list aligned with items holding each score, or None where the model gave none.
+    """
+    if not items:
+        return []
+    
+    model, budgets = _prompt_budget_config('evaluate_answers_batch', "gpt-4o-mini")
+    fitted_items = [
+        fit_inputs('evaluate_answers_batch', model=model, prompt_budgets=budgets, question=item['question'], answer=item['answer'])
+        for item in items
+    ]
+    answers_block = "\n\n".join([
+        f"[{index}] Question: {fitted['question']}\nAnswer: {fitted['answer']}\nMaximum Score: {item['weightage']}"
+        for index, (item, fitted) in enumerate(zip(items, fitted_items), start=1)
+    ])
+    
+    # Try to get prompt from database
+    prompt_config = get_prompt('evaluate_answers_batch', answers_block=answers_block, total_questions=len(items))
+    
+    # Fallback to default prompt if not in database
+    if not prompt_config:
+        prompt = f"""You are an expert HR interviewer evaluating all of a candidate's interview answers. Score each answer independently with fair, context-aware scoring.
+
+{answers_block}
+
+SCORING GUIDELINES:
+- Yes/No or simple factual questions: a short but CORRECT answer deserves 80-100% of its maximum score
+- Experience and behavioral questions need detail and examples; brief answers score 30-60%, detailed relevant answers 60-100%
+- Incorrect, contradictory or irrelevant answers score 0-40%
+- Focus on whether the answer is CORRECT and RELEVANT, not just length
+- Never exceed an answer's Maximum Score
+
+Return ONLY a valid JSON object with one entry for each of the {len(items)} answers, using the numbers in brackets as ids:
+{{
+    "scores": [
+        {{"id": <answer number>, "score": <number between 0 and that answer's Maximum Score>, "feedback": "Brief feedback"}}
+    ]
+}}
+"""
+        system_message = "You are an expert HR interviewer with strong contextual understanding. You evaluate answers fairly based on question type and provide appropriate scores. You understand that simple questions deserve high scores for correct simple answers."
+        model = "gpt-4o-mini"
+        temperature = 0.3
+    else:
+        prompt = prompt_config['prompt']
+        system_message = prompt_config['system_message']
+        model = prompt_config['model']
+        temperature = prompt_config['temperature']
+    
+    scores = [None] * len(items)
+    try:
+        response = chat_completion(model, system_message, prompt, temperature, priority=PRIORITY_LIVE)
+        
+        content = response.choices[0].message.content.strip()
+        
+        # Extract JSON
+        json_match = re.search(r'\{.*\}', content, re.DOTALL)
+        if not json_match:
+            skip_llm_cache()
+            return scores
+        result = json.loads(json_match.group())
+        
+        for entry in result.get('scores', []):
+            try:
+                index = int(entry.get('id')) - 1
+                score = float(entry.get('score'))
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < len(items):
+                scores[index] = max(0.0, min(score, float(items[index]['weightage'])))
+        if None in scores:
+            skip_llm_cache()  # Partial results are re-requested rather than cached
+        return scores
+        
+    except Exception as e:
+        print(f"Error evaluating answers in batch: {e}")
+        skip_llm_cache()
+        return scores
+
+@memoize_llm('personality_profile', key_inputs=lambda cv_summary, answers_data: [
+    cv_summary, [[a['question'], a['answer']] for a in answers_data]
+])
 def generate_personality_profile(cv_summary, answers_data):
     """Generate personality profile based on CV and interview answers"""
-    client = get_openai_client()
-    
-    answers_text = "\n".join([f"Q: {a['question']}\nA: {a['answer']}" for a in answers_data])
+    model, budgets = _prompt_budget_config('personality_profile', "gpt-3.5-turbo")
+    cv_summary = fit_inputs('personality_profile', model=model, prompt_budgets=budgets, cv_summary=cv_summary)['cv_summary']
+    # The answers share one budget so a single long answer cannot crowd out the rest
+    answers_text = "\n".join(fit_items(
+        [f"Q: {a['question']}\nA: {a['answer']}" for a in answers_data],
+        budgets.get('answers_text'),
+        model
+    ))
     
     # Try to get prompt from database
     prompt_config = get_prompt('personality_profile', cv_summary=cv_summary, answers_text=answers_text)
@@ -340,33 +615,32 @@ Focus on:
         temperature = prompt_config['temperature']
     
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=temperature
-        )
+        response = chat_completion(model, system_message, prompt, temperature, priority=PRIORITY_BACKGROUND)
         
         return response.choices[0].message.content.strip()
         
     except Exception as e:
         print(f"Error generating personality profile: {e}")
+        skip_llm_cache()
         return "Personality profile analysis pending."
 
 def transcribe_audio(audio_path):
     """Transcribe audio file using OpenAI Whisper"""
-    client = get_openai_client()
-    
     try:
         full_path = os.path.join(current_app.root_path, 'static', audio_path)
         
+        # Read once so a retried request can resend the same bytes
         with open(full_path, 'rb') as audio_file:
-            transcript = client.audio.transcriptions.create(
+            audio = (os.path.basename(full_path), audio_file.read())
+        
+        transcript = call_openai(
+            "whisper-1",
+            lambda client: client.audio.transcriptions.with_raw_response.create(
                 model="whisper-1",
-                file=audio_file
-            )
+                file=audio
+            ),
+            priority=PRIORITY_LIVE
+        )
         
         return transcript.text
         
@@ -374,20 +648,95 @@ def transcribe_audio(audio_path):
         print(f"Error transcribing audio: {e}")
         return ""
 
+def transcribe_audio_bytes(audio_bytes, filename="segment.mp3", prompt=None):
+    """Transcribe in-memory audio; prompt carries the preceding transcript for continuity"""
+    params = {
+        'model': "whisper-1",
+        'file': (filename, audio_bytes)
+    }
+    if prompt:
+        # Whisper only looks at the last ~224 tokens of the prompt
+        params['prompt'] = prompt[-800:]
+    
+    transcript = call_openai(
+        "whisper-1",
+        lambda client: client.audio.transcriptions.with_raw_response.create(**params),
+        priority=PRIORITY_LIVE
+    )
+    
+    return transcript.text
+
+# Text-to-speech settings (also part of the TTS cache key)
+TTS_MODEL = "tts-1-hd"  # High quality, more natural
+TTS_VOICE = "nova"  # Natural, human-like female voice
+TTS_FORMAT = "mp3"
+
 def generate_speech(text):
     """Generate speech from text using OpenAI TTS with natural female voice"""
-    client = get_openai_client()
+    cache = get_tts_cache()
+    cache_key = TTSCache.key(text, TTS_MODEL, TTS_VOICE, TTS_FORMAT)
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
     
     try:
-        response = client.audio.speech.create(
-            model="tts-1-hd",  # High quality, more natural
-            voice="nova",  # Natural, human-like female voice
-            input=text
+        response, answered_by = hedged_call(
+            'generate_speech',
+            TTS_MODEL,
+            lambda model: call_openai(
+                model,
+                lambda client: client.audio.speech.with_raw_response.create(
+                    model=model,
+                    voice=TTS_VOICE,
+                    input=text,
+                    response_format=TTS_FORMAT
+                ),
+                priority=PRIORITY_LIVE
+            )
         )
         
+        # Audio from a fallback model is used once but not cached as the configured voice
+        if cache and answered_by == TTS_MODEL:
+            cache.put(cache_key, response.content)
         return response.content
         
     except Exception as e:
         print(f"Error generating speech: {e}")
         return None
 
+def stream_speech(text, chunk_size=16384):
+    """Yield speech audio chunks as the TTS response arrives (cached audio is yielded at once)"""
+    cache = get_tts_cache()
+    cache_key = TTSCache.key(text, TTS_MODEL, TTS_VOICE, TTS_FORMAT)
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+    
+    client = get_openai_client()
+    scheduler = get_llm_scheduler()
+    received = []
+    # Streams are not retried: chunks may already have reached the client
+    with scheduler.slot(TTS_MODEL, priority=PRIORITY_LIVE):
+        with client.audio.speech.with_streaming_response.create(
+            model=TTS_MODEL,
+            voice=TTS_VOICE,
+            input=text,
+            response_format=TTS_FORMAT
+        ) as response:
+            scheduler.record(TTS_MODEL, response.headers)
+            for chunk in response.iter_bytes(chunk_size):
+                if chunk:
+                    received.append(chunk)
+                    yield chunk
+    
+    if cache and received:
+        cache.put(cache_key, b''.join(received))
+
+def invalidate_speech(text):
+    """Drop cached speech for a piece of text (e.g. when a question is edited)"""
+    cache = get_tts_cache()
+    if cache and text:
+        cache.invalidate(TTSCache.key(text, TTS_MODEL, TTS_VOICE, TTS_FORMAT))
@@ -0,0 +1,155 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+from app import socketio
+
+
+class AudioPoolSaturated(Exception):
+    """Raised when the transcoding queue is full; the client should retry after retry_after seconds"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Audio processing is busy, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _timed_call(fn, args, kwargs):
+    # Runs in the worker process; the start time lets the parent measure queue wait
+    started_at = time.time()
+    return started_at, fn(*args, **kwargs)
+
+
+class AudioTranscodePool:
+    """Process pool for CPU-bound audio work with a bounded queue and wait-time metrics"""
+
+    def __init__(self, workers, queue_size, retry_after=5, cancel_grace=5.0):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        # How long a timed-out job that already started gets to stop and remove its output
+        self.cancel_grace = cancel_grace
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor = None
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn: workers must not inherit the server's sockets or patched modules
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+        return self._executor
+
+    def run(self, fn, *args, timeout=None, **kwargs):
+        """Run fn in a worker process; raises AudioPoolSaturated instead of queueing without bound"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            current_app.logger.warning(
+                "Audio pool saturated (%d in flight), rejecting job", self.in_flight
+            )
+            raise AudioPoolSaturated(self.retry_after)
+
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+        submitted_at = time.time()
+        try:
+            future = self._get_executor().submit(_timed_call, fn, args, kwargs)
+        except Exception:
+            self._release_slot()
+            with self._lock:
+                self.failed += 1
+            raise
+        # The slot is held until the job really ends: a timed-out ffmpeg run keeps its worker busy
+        future.add_done_callback(lambda _: self._release_slot())
+        try:
+            deadline = time.monotonic() + timeout if timeout else None
+            # Poll instead of blocking so other interviews keep running on this worker
+            while not future.done():
+                if deadline and time.monotonic() > deadline:
+                    if not future.cancel():
+                        # Already running: the job stops at the same deadline, so wait for it to
+                        # clean up its output before the caller falls back
+                        grace_end = time.monotonic() + self.cancel_grace
+                        while not future.done() and time.monotonic() < grace_end:
+                            socketio.sleep(0.05)
+                    raise TimeoutError("Audio job timed out")
+                socketio.sleep(0.05)
+            started_at, result = future.result()
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+
+        wait = max(0.0, started_at - submitted_at)
+        with self._lock:
+            self.completed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        return result
+
+    def _release_slot(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'in_flight': self.in_flight,
+            'queue_depth': max(0, self.in_flight - self.workers),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'avg_wait_seconds': (self.total_wait / self.completed) if self.completed else 0.0,
+            'max_wait_seconds': self.max_wait
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def init_audio_pool(app):
+    """Create the app-scoped transcoding pool (None when AUDIO_POOL_WORKERS is 0)"""
+    workers = app.config.get('AUDIO_POOL_WORKERS', 2)
+    pool = None
+    if workers > 0:
+        pool = AudioTranscodePool(
+            workers,
+            app.config.get('AUDIO_POOL_QUEUE_SIZE', 8),
+            app.config.get('AUDIO_POOL_RETRY_AFTER', 5)
+        )
+    app.extensions['audio_pool'] = pool
+    return pool
+
+
+def run_audio_job(fn, *args, **kwargs):
+    """
+    Run an audio job on the pool, or inline when the pool is disabled. fn receives deadline
+    (a time.time() value) and must stop and remove its partial output once it passes.
+    """
+    if 'audio_pool' not in current_app.extensions:
+        init_audio_pool(current_app._get_current_object())
+    pool = current_app.extensions['audio_pool']
+    timeout = current_app.config.get('AUDIO_POOL_TIMEOUT', 120)
+    kwargs['deadline'] = time.time() + timeout
+    if pool is None:
+        return fn(*args, **kwargs)
+    return pool.run(fn, *args, timeout=timeout, **kwargs)
@@ -0,0 +1,80 @@
+import re
+from flask import current_app
+from app import db
+from app.models import Candidate, Job
+from app.services.ai_service import analyze_cv, get_cv_text
+from app.services.matching_service import rerank_job_applicants
+from app.services.search_service import index_application
+from app.utils.background import run_in_background
+
+PENDING_SUMMARY = "Analysis pending"
+
+
+def clean_matching_percentage(value):
+    """Ensure we persist a numeric matching percentage (0-100)."""
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return max(0.0, min(float(value), 100.0))
+    if isinstance(value, str):
+        match = re.search(r'-?\d+(\.\d+)?', value)
+        if match:
+            try:
+                return max(0.0, min(float(match.group()), 100.0))
+            except ValueError:
+                pass
+    return 0.0
+
+
+def run_cv_analysis(candidate_id, job_id):
+    """Extract the candidate's CV text, analyze it against the job and store the result"""
+    candidate = Candidate.query.get(candidate_id)
+    job = Job.query.get(job_id)
+    if not candidate or not job:
+        return None
+
+    try:
+        # Text already extracted from an identical CV is reused instead of re-parsing the PDF
+        cv_text = candidate.cv_text or get_cv_text(candidate.cv_path, candidate.cv_hash)
+        cv_analysis = analyze_cv(candidate.cv_path, job.description_html, cv_text=cv_text, cv_hash=candidate.cv_hash)
+        if cv_analysis.get('failed'):
+            # LLM/network errors come back as a fallback result; keep the text and mark the row for a re-run
+            candidate.cv_text = cv_text or None
+            candidate.cv_analysis_status = 'failed'
+            db.session.commit()
+            current_app.logger.warning(
+                "CV analysis failed for candidate %s: %s", candidate_id, cv_analysis.get('summary')
+            )
+            return None
+        candidate.cv_text = cv_text or None
+        candidate.cv_summary = cv_analysis.get('summary', PENDING_SUMMARY)
+        candidate.matching_percentage = clean_matching_percentage(cv_analysis.get('matching_percentage'))
+        candidate.cv_analysis_status = 'completed'
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("CV analysis failed for candidate %s", candidate_id)
+        candidate = Candidate.query.get(candidate_id)
+        if candidate:
+            candidate.cv_analysis_status = 'failed'
+            db.session.commit()
+        return None
+
+    for application in candidate.applications:
+        index_application(application.id)
+
+    # BM25 IDF depends on the applicant pool, so the job's ranking is refreshed as a whole
+    try:
+        rerank_job_applicants(job_id)
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("Lexical ranking failed for job %s", job_id)
+    return candidate.cv_summary
+
+
+def schedule_cv_analysis(candidate, job):
+    """Analyze a committed candidate's CV in a background task"""
+    candidate.cv_analysis_status = 'pending'
+    candidate.cv_summary = PENDING_SUMMARY
+    db.session.commit()
+    return run_in_background(run_cv_analysis, candidate.id, job.id)
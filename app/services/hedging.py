@@ -0,0 +1,160 @@
+import math
+import threading
+import time
+from collections import deque
+from flask import current_app
+from app import socketio
+from app.utils.background import run_in_background
+
+
+def _parse_names(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+def _parse_fallbacks(value):
+    """Parse 'call:model,call:model' into a dict"""
+    fallbacks = {}
+    for item in (value or '').split(','):
+        if ':' not in item:
+            continue
+        name, model = item.split(':', 1)
+        if name.strip() and model.strip():
+            fallbacks[name.strip()] = model.strip()
+    return fallbacks
+
+
+class RequestHedger:
+    """
+    Opt-in hedging for latency-critical calls: when a call has not answered by a percentile of
+    its recent latencies, a duplicate is sent (to the fallback model when one is configured),
+    the first success is used and the other request is cancelled.
+    """
+
+    def __init__(self, config):
+        self.enabled = config.get('HEDGE_ENABLED', False)
+        self.calls = _parse_names(config.get('HEDGE_CALLS', 'evaluate_answer,generate_speech'))
+        self.fallback_models = _parse_fallbacks(config.get('HEDGE_FALLBACK_MODELS', ''))
+        self.percentile = config.get('HEDGE_PERCENTILE', 95.0)
+        self.min_samples = config.get('HEDGE_MIN_SAMPLES', 20)
+        self.initial_delay = config.get('HEDGE_INITIAL_DELAY', 3.0)
+        self.min_delay = config.get('HEDGE_MIN_DELAY', 0.5)
+        # Cap on the share of calls that may be duplicated, so a slow provider is not hit twice as hard
+        self.max_ratio = config.get('HEDGE_MAX_RATIO', 0.1)
+        self.window = config.get('HEDGE_WINDOW', 200)
+
+        self._latencies = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, name):
+        counters = self._counters.get(name)
+        if counters is None:
+            counters = self._counters[name] = {
+                'calls': 0, 'hedged': 0, 'hedge_won': 0, 'primary_won': 0, 'failed': 0
+            }
+        return counters
+
+    def delay(self, name):
+        """Seconds to wait before hedging: the configured percentile of recent latencies"""
+        with self._lock:
+            samples = sorted(self._latencies.get(name, ()))
+        if len(samples) < self.min_samples:
+            return self.initial_delay
+        rank = max(0, math.ceil(self.percentile / 100.0 * len(samples)) - 1)
+        return max(self.min_delay, samples[rank])
+
+    def _record(self, name, started):
+        with self._lock:
+            latencies = self._latencies.get(name)
+            if latencies is None:
+                latencies = self._latencies[name] = deque(maxlen=self.window)
+            latencies.append(time.monotonic() - started)
+
+    def _may_hedge(self, name):
+        with self._lock:
+            counters = self._stats(name)
+            if counters['hedged'] >= counters['calls'] * self.max_ratio:
+                return False
+            counters['hedged'] += 1
+            return True
+
+    def run(self, name, model, fn):
+        """Call fn(model), hedging it if enabled for name; returns (result, model that answered)"""
+        if not self.enabled or name not in self.calls:
+            return fn(model), model
+
+        with self._lock:
+            self._stats(name)['calls'] += 1
+        started = time.monotonic()
+        primary = run_in_background(fn, model)
+        primary.wait(self.delay(name))
+
+        if primary.done() or not self._may_hedge(name):
+            try:
+                result = primary.result()
+            except Exception:
+                with self._lock:
+                    self._stats(name)['failed'] += 1
+                raise
+            self._record(name, started)
+            return result, model
+
+        hedge_model = self.fallback_models.get(name, model)
+        current_app.logger.info(
+            "Hedging %s after %.2fs with %s", name, time.monotonic() - started, hedge_model
+        )
+        pending = {primary: ('primary_won', model), run_in_background(fn, hedge_model): ('hedge_won', hedge_model)}
+        # Both tasks set one shared event when they finish, so the race is waited on without polling
+        finished = socketio.server.eio.create_event()
+        for task in pending:
+            task.add_done_callback(lambda _: finished.set())
+        finished.wait()
+        error = None
+        while pending:
+            for task in [task for task in pending if task.done()]:
+                outcome, used_model = pending.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    error = e
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                self._record(name, started)
+                with self._lock:
+                    self._stats(name)[outcome] += 1
+                return result, used_model
+            if pending:
+                # The first to finish failed; only the other one is left to wait for
+                next(iter(pending)).wait()
+
+        with self._lock:
+            self._stats(name)['failed'] += 1
+        raise error
+
+    def stats(self):
+        with self._lock:
+            counters = {name: dict(values) for name, values in self._counters.items()}
+        for name, values in counters.items():
+            values['hedge_rate'] = (values['hedged'] / values['calls']) if values['calls'] else 0.0
+            values['delay_seconds'] = self.delay(name)
+        return {'enabled': self.enabled, 'calls': counters}
+
+
+def init_hedger(app):
+    """Create the app-scoped request hedger"""
+    hedger = RequestHedger(app.config)
+    app.extensions['request_hedger'] = hedger
+    return hedger
+
+
+def get_hedger():
+    hedger = current_app.extensions.get('request_hedger')
+    if hedger is None:
+        hedger = init_hedger(current_app._get_current_object())
+    return hedger
+
+
+def hedged_call(name, model, fn):
+    """Shortcut for get_hedger().run(name, model, fn)"""
+    return get_hedger().run(name, model, fn)
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import current_app
+from sqlalchemy.orm import Session
+from app import db
+from app.models import LLMCacheEntry
+
+# Per-call flag set by fallback/error paths so their placeholder results are not cached
+_call_state = threading.local()
+
+
+def skip_llm_cache():
+    """Mark the current memoized call's result as not cacheable (e.g. a default after an API error)"""
+    _call_state.skip = True
+
+
+def _parse_ttls(value):
+    """Parse 'evaluate_answer:604800,analyze_cv:2592000' into {function: seconds}"""
+    ttls = {}
+    for item in (value or '').split(','):
+        name, _, seconds = item.partition(':')
+        if name.strip() and seconds.strip():
+            try:
+                ttls[name.strip()] = int(seconds)
+            except ValueError:
+                print(f"Ignoring invalid LLM cache TTL: {item}")
+    return ttls
+
+
+def _normalize(value):
+    # Whitespace-only differences (trailing newlines, double spaces) should share an entry
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+class LLMResultCache:
+    """Two-tier memo of LLM results: an in-process LRU in front of the shared llm_cache_entries table"""
+
+    def __init__(self, memory_size, default_ttl, ttls=None, use_db=True):
+        self.memory_size = memory_size
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self.use_db = use_db
+        self._memory = OrderedDict()  # key -> (expires_at monotonic, value)
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._puts = 0
+
+    def ttl_for(self, function):
+        return self.ttls.get(function, self.default_ttl)
+
+    def _count(self, function, field):
+        with self._lock:
+            counters = self._stats.setdefault(function, {
+                'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'stores': 0, 'skipped': 0
+            })
+            counters[field] += 1
+
+    @staticmethod
+    def make_key(function, prompt_signature, inputs):
+        payload = json.dumps([function, prompt_signature, _normalize(inputs)], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, function, key):
+        """Return (hit, value), checking memory first and then the database"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                else:
+                    del self._memory[key]
+                    entry = None
+        if entry is not None:
+            self._count(function, 'memory_hits')
+            return True, entry[1]
+
+        if self.use_db:
+            try:
+                with Session(db.engine) as session:
+                    row = session.get(LLMCacheEntry, key)
+                    if row is not None and row.expires_at > datetime.utcnow():
+                        value = json.loads(row.value)
+                        remaining = (row.expires_at - datetime.utcnow()).total_seconds()
+                        self._remember(key, value, remaining)
+                        self._count(function, 'db_hits')
+                        return True, value
+            except Exception as e:
+                current_app.logger.warning("LLM cache lookup failed: %s", e)
+
+        self._count(function, 'misses')
+        return False, None
+
+    def _remember(self, key, value, ttl):
+        with self._lock:
+            self._memory[key] = (time.monotonic() + ttl, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def put(self, function, key, value):
+        ttl = self.ttl_for(function)
+        if ttl <= 0:
+            return
+        self._remember(key, value, ttl)
+        self._count(function, 'stores')
+        if not self.use_db:
+            return
+        try:
+            # Own session so caching never commits the caller's pending changes
+            with Session(db.engine) as session:
+                row = session.get(LLMCacheEntry, key) or LLMCacheEntry(key=key)
+                row.function = function
+                row.value = json.dumps(value)
+                row.created_at = datetime.utcnow()
+                row.expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+                session.add(row)
+                self._puts += 1
+                if self._puts % 100 == 0:
+                    session.query(LLMCacheEntry).filter(
+                        LLMCacheEntry.expires_at <= datetime.utcnow()
+                    ).delete(synchronize_session=False)
+                session.commit()
+        except Exception as e:
+            current_app.logger.warning("LLM cache store failed: %s", e)
+
+    def skipped(self, function):
+        self._count(function, 'skipped')
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self):
+        with self._lock:
+            functions = {}
+            for function, counters in self._stats.items():
+                hits = counters['memory_hits'] + counters['db_hits']
+                lookups = hits + counters['misses']
+                functions[function] = dict(counters, hit_rate=(hits / lookups) if lookups else 0.0)
+            return {
+                'memory_entries': len(self._memory),
+                'memory_size': self.memory_size,
+                'functions': functions
+            }
+
+
+def init_llm_cache(app):
+    """Create the app-scoped LLM result cache"""
+    cache = LLMResultCache(
+        app.config.get('LLM_CACHE_MEMORY_SIZE', 1024),
+        app.config.get('LLM_CACHE_DEFAULT_TTL', 86400),
+        _parse_ttls(app.config.get('LLM_CACHE_TTLS', '')),
+        app.config.get('LLM_CACHE_DB_ENABLED', True)
+    )
+    app.extensions['llm_cache'] = cache
+    return cache
+
+
+def get_llm_cache():
+    """Return the LLM result cache, or None when it is disabled"""
+    if not current_app.config.get('LLM_CACHE_ENABLED', True):
+        return None
+    cache = current_app.extensions.get('llm_cache')
+    if cache is None:
+        cache = init_llm_cache(current_app._get_current_object())
+    return cache
+
+
+def _prompt_signature(prompt_key):
+    # Editing a prompt bumps the shared version, so old results stop matching
+    from app.services.prompt_registry import get_prompt_registry
+
+    prompt = get_prompt_registry().get(prompt_key)
+    if prompt is None:
+        return [prompt_key, 'builtin']
+    return [prompt_key, prompt.version, prompt.model, prompt.temperature]
+
+
+def memoize_llm(prompt_key, key_inputs=None):
+    """
+    Cache an ai_service entry point's result by prompt key/version, model, temperature
+    and normalized inputs. key_inputs(*args, **kwargs) can replace the raw arguments in the
+    key (e.g. a file hash instead of a path). Results flagged with skip_llm_cache() are not stored.
+    """
+    def decorator(fn):
+        function = fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache = get_llm_cache()
+            if cache is None or cache.ttl_for(function) <= 0:
+                return fn(*args, **kwargs)
+            try:
+                inputs = key_inputs(*args, **kwargs) if key_inputs else [list(args), kwargs]
+                key = cache.make_key(function, _prompt_signature(prompt_key), inputs)
+            except Exception as e:
+                current_app.logger.warning("LLM cache key for %s unavailable: %s", function, e)
+                return fn(*args, **kwargs)
+
+            hit, value = cache.get(function, key)
+            if hit:
+                return value
+
+            _call_state.skip = False
+            value = fn(*args, **kwargs)
+            if getattr(_call_state, 'skip', False):
+                cache.skipped(function)
+            else:
+                cache.put(function, key, value)
+            _call_state.skip = False
+            return value
+        return wrapper
+    return decorator
@@ -0,0 +1,302 @@
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+import openai
+from flask import current_app
+from app import socketio
+from app.services.ai_client import model_slot
+
+# Priority classes: lower values are admitted first
+PRIORITY_LIVE = 0  # A candidate is waiting on the result (transcription, TTS, answer scoring)
+PRIORITY_BACKGROUND = 1  # CV analysis, question generation, profiles
+PRIORITY_NAMES = {PRIORITY_LIVE: 'live', PRIORITY_BACKGROUND: 'background'}
+
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,  # Includes APITimeoutError
+    openai.InternalServerError
+)
+_DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {'h': 3600.0, 'm': 60.0, 's': 1.0, 'ms': 0.001}
+
+
+class SchedulerTimeout(Exception):
+    """Raised when a request is not admitted before its queue timeout"""
+
+
+def parse_duration(value):
+    """Parse rate-limit reset values such as '1s', '6m0s' or '20ms' into seconds"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    matches = _DURATION_RE.findall(value)
+    if not matches:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in matches)
+
+
+def _header_int(headers, name):
+    try:
+        return int(float(headers.get(name)))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Refilling budget of requests or tokens per minute, resynced from the provider's headers"""
+
+    def __init__(self, capacity, period=60.0):
+        self.capacity = float(max(1, capacity))
+        self.period = period
+        self.level = self.capacity
+        self.blocked_until = 0.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / self.period)
+        self.updated = now
+
+    def wait_time(self, amount, reserve=0.0, now=None):
+        """Seconds until amount can be taken while leaving reserve (a fraction of capacity) untouched"""
+        now = now or time.monotonic()
+        self._refill(now)
+        needed = min(amount, self.capacity) + reserve * self.capacity
+        blocked = max(0.0, self.blocked_until - now)
+        if self.level >= needed:
+            return blocked
+        return max(blocked, (needed - self.level) * self.period / self.capacity)
+
+    def take(self, amount):
+        self.level -= min(amount, self.capacity)
+
+    def sync(self, limit, remaining, reset_seconds, now=None):
+        now = now or time.monotonic()
+        self._refill(now)
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            # Other processes share the same limit, so the provider's count wins when lower
+            self.level = min(self.level, float(remaining))
+            if remaining <= 0 and reset_seconds:
+                self.blocked_until = max(self.blocked_until, now + reset_seconds)
+
+    def drain(self, seconds, now=None):
+        now = now or time.monotonic()
+        self.level = 0.0
+        self.updated = now
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+
+class ModelLimiter:
+    """Request and token buckets for one model"""
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def wait_time(self, tokens, reserve):
+        now = time.monotonic()
+        return max(self.requests.wait_time(1, reserve, now), self.tokens.wait_time(tokens, reserve, now))
+
+    def take(self, tokens):
+        self.requests.take(1)
+        self.tokens.take(tokens)
+
+    def sync(self, headers):
+        self.requests.sync(
+            _header_int(headers, 'x-ratelimit-limit-requests'),
+            _header_int(headers, 'x-ratelimit-remaining-requests'),
+            parse_duration(headers.get('x-ratelimit-reset-requests'))
+        )
+        self.tokens.sync(
+            _header_int(headers, 'x-ratelimit-limit-tokens'),
+            _header_int(headers, 'x-ratelimit-remaining-tokens'),
+            parse_duration(headers.get('x-ratelimit-reset-tokens'))
+        )
+
+
+class LLMScheduler:
+    """
+    Admits OpenAI requests per model in priority order, paced by token buckets that follow the
+    provider's rate-limit headers, and retries throttled or failed calls with jittered backoff.
+    Live requests always go ahead of queued background ones, and background requests leave
+    LLM_LIVE_RESERVE of each bucket free for them.
+    """
+
+    def __init__(self, config):
+        self.default_rpm = config.get('LLM_DEFAULT_RPM', 500)
+        self.default_tpm = config.get('LLM_DEFAULT_TPM', 200000)
+        self.live_reserve = config.get('LLM_LIVE_RESERVE', 0.2)
+        self.queue_timeout = config.get('LLM_QUEUE_TIMEOUT', 60.0)
+        self.max_retries = {
+            PRIORITY_LIVE: config.get('LLM_LIVE_MAX_RETRIES', 2),
+            PRIORITY_BACKGROUND: config.get('LLM_BACKGROUND_MAX_RETRIES', 5)
+        }
+        self.backoff_base = config.get('LLM_BACKOFF_BASE', 0.5)
+        self.backoff_cap = {
+            PRIORITY_LIVE: config.get('LLM_LIVE_BACKOFF_CAP', 4.0),
+            PRIORITY_BACKGROUND: config.get('LLM_BACKOFF_CAP', 30.0)
+        }
+
+        self._limiters = {}
+        self._queues = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+        self.submitted = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.queued_seconds = {name: 0.0 for name in PRIORITY_NAMES.values()}
+        self.retries = 0
+        self.rate_limited = 0
+        self.failed = 0
+        self.timeouts = 0
+
+    def _limiter(self, model):
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = self._limiters[model] = ModelLimiter(self.default_rpm, self.default_tpm)
+        return limiter
+
+    def _admit(self, model, priority, tokens):
+        """Wait until this request is first in its model's queue and the buckets allow it"""
+        entry = (priority, next(self._sequence))
+        reserve = 0.0 if priority == PRIORITY_LIVE else self.live_reserve
+        started = time.monotonic()
+        deadline = started + self.queue_timeout if self.queue_timeout else None
+        with self._lock:
+            queue = self._queues.setdefault(model, [])
+            heapq.heappush(queue, entry)
+        try:
+            while True:
+                with self._lock:
+                    if queue[0] == entry:
+                        limiter = self._limiter(model)
+                        wait = limiter.wait_time(tokens, reserve)
+                        if wait <= 0:
+                            heapq.heappop(queue)
+                            limiter.take(tokens)
+                            name = PRIORITY_NAMES[priority]
+                            self.submitted[name] += 1
+                            self.queued_seconds[name] += time.monotonic() - started
+                            return
+                    else:
+                        wait = 0.05  # Someone with higher priority (or earlier) is ahead
+                if deadline and time.monotonic() + min(wait, 0.25) > deadline:
+                    self.timeouts += 1
+                    raise SchedulerTimeout(f"Request for {model} not admitted within {self.queue_timeout}s")
+                socketio.sleep(min(wait, 0.25))
+        except BaseException:
+            with self._lock:
+                if entry in queue:
+                    queue.remove(entry)
+                    heapq.heapify(queue)
+            raise
+
+    def record(self, model, headers):
+        """Resync a model's buckets from a response's rate-limit headers"""
+        if not headers:
+            return
+        with self._lock:
+            self._limiter(model).sync(headers)
+
+    def _backoff(self, attempt, priority, retry_after=None):
+        # Full jitter spreads retries from many workers instead of synchronizing them
+        delay = random.uniform(0, min(self.backoff_cap[priority], self.backoff_base * (2 ** attempt)))
+        if retry_after:
+            delay = max(delay, min(retry_after, self.backoff_cap[priority]))
+        return delay
+
+    def call(self, model, send, priority=PRIORITY_BACKGROUND, tokens=0):
+        """
+        Run send() - one API attempt made through with_raw_response - under the scheduler
+        and return the parsed response. Raises the last error once retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            self._admit(model, priority, tokens)
+            try:
+                with model_slot(model):
+                    raw = send()
+            except _RETRYABLE_ERRORS as e:
+                response = getattr(e, 'response', None)
+                headers = response.headers if response is not None else None
+                self.record(model, headers)
+                retry_after = parse_duration(headers.get('retry-after')) if headers else None
+                if isinstance(e, openai.RateLimitError):
+                    self.rate_limited += 1
+                    if getattr(e, 'code', None) == 'insufficient_quota':
+                        self.failed += 1
+                        raise  # Waiting will not bring the quota back
+                    with self._lock:
+                        self._limiter(model).requests.drain(retry_after or self.backoff_base)
+                if attempt >= self.max_retries[priority]:
+                    self.failed += 1
+                    raise
+                delay = self._backoff(attempt, priority, retry_after)
+                attempt += 1
+                self.retries += 1
+                current_app.logger.warning(
+                    "%s request for %s failed (%s), retry %d in %.2fs",
+                    PRIORITY_NAMES[priority], model, type(e).__name__, attempt, delay
+                )
+                socketio.sleep(delay)
+                continue
+            except Exception:
+                self.failed += 1
+                raise
+            self.record(model, raw.headers)
+            return raw.parse()
+
+    @contextmanager
+    def slot(self, model, priority=PRIORITY_BACKGROUND, tokens=0):
+        """Admit a single streaming call (not retried); pass its headers to record()"""
+        self._admit(model, priority, tokens)
+        with model_slot(model):
+            yield self
+
+    def stats(self):
+        with self._lock:
+            models = {
+                model: {
+                    'queued': len(self._queues.get(model, [])),
+                    'requests_available': round(limiter.requests.level, 1),
+                    'requests_per_minute': limiter.requests.capacity,
+                    'tokens_available': round(limiter.tokens.level),
+                    'tokens_per_minute': limiter.tokens.capacity
+                }
+                for model, limiter in self._limiters.items()
+            }
+        return {
+            'submitted': dict(self.submitted),
+            'avg_queue_seconds': {
+                name: (self.queued_seconds[name] / count) if count else 0.0
+                for name, count in self.submitted.items()
+            },
+            'retries': self.retries,
+            'rate_limited': self.rate_limited,
+            'failed': self.failed,
+            'timeouts': self.timeouts,
+            'models': models
+        }
+
+
+def init_llm_scheduler(app):
+    """Create the app-scoped LLM request scheduler"""
+    scheduler = LLMScheduler(app.config)
+    app.extensions['llm_scheduler'] = scheduler
+    return scheduler
+
+
+def get_llm_scheduler():
+    """Get the scheduler for the current app, creating it if the app skipped init"""
+    scheduler = current_app.extensions.get('llm_scheduler')
+    if scheduler is None:
+        scheduler = init_llm_scheduler(current_app._get_current_object())
+    return scheduler
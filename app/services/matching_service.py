@@ -0,0 +1,104 @@
+import html
+import re
+import time
+from collections import Counter
+import numpy as np
+from flask import current_app
+from app import db
+from app.models import Application, Candidate, Job
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both
+but by can could did do does doing down during each etc few for from further had has have having he her here
+hers him his how i if in into is it its itself just me more most my no nor not of off on once only or other
+our ours out over own per same she should so some such than that the their theirs them then there these they
+this those through to too under until up very via was we were what when where which while who whom why will
+with within without would you your yours able must including strong good excellent work working
+experience years year role team candidate candidates job responsibilities requirements required preferred
+""".split())
+
+
+def tokenize(text):
+    """Lower-case word tokens without HTML markup or stopwords (keeps terms like c++, c#, node.js)"""
+    text = html.unescape(_TAG_RE.sub(' ', text or '')).lower()
+    return [token for token in _TOKEN_RE.findall(text) if len(token) > 1 and token not in STOPWORDS]
+
+
+class BM25Matcher:
+    """BM25 scoring of many CVs against one job description in a single vectorized pass"""
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+
+    def score(self, job_description, documents):
+        """
+        Return an array of 0-100 scores, one per document. A score is the BM25 relevance divided
+        by its ceiling (every job term present with saturated frequency), so it is comparable
+        across jobs; IDF comes from the batch, so rank a job's applicants together.
+        """
+        query_counts = Counter(tokenize(job_description))
+        if not documents:
+            return np.zeros(0)
+        if not query_counts:
+            return np.zeros(len(documents))
+
+        vocabulary = {term: index for index, term in enumerate(query_counts)}
+        # Repeated job terms matter more, with diminishing returns
+        query_weights = 1.0 + np.log(np.fromiter(query_counts.values(), dtype=np.float64))
+
+        tf = np.zeros((len(documents), len(vocabulary)), dtype=np.float64)
+        lengths = np.zeros(len(documents), dtype=np.float64)
+        for row, document in enumerate(documents):
+            tokens = tokenize(document)
+            lengths[row] = len(tokens)
+            for term, count in Counter(tokens).items():
+                column = vocabulary.get(term)
+                if column is not None:
+                    tf[row, column] = count
+
+        document_frequency = np.count_nonzero(tf, axis=0)
+        idf = np.log1p((len(documents) - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        average_length = lengths.mean() or 1.0
+        norm = self.k1 * (1.0 - self.b + self.b * lengths / average_length)
+        saturated = tf * (self.k1 + 1.0) / (tf + norm[:, None])
+
+        term_weights = idf * query_weights
+        ceiling = float(term_weights.sum() * (self.k1 + 1.0))
+        if ceiling <= 0:
+            return np.zeros(len(documents))
+        return np.clip(saturated @ term_weights / ceiling * 100.0, 0.0, 100.0)
+
+
+def rerank_job_applicants(job_id):
+    """Score every applicant of a job with a CV text and store Candidate.lexical_match_score"""
+    job = Job.query.get(job_id)
+    if not job:
+        return 0
+
+    candidates = Candidate.query.join(Application).filter(
+        Application.job_id == job_id,
+        Candidate.cv_text.isnot(None)
+    ).all()
+    if not candidates:
+        return 0
+
+    started = time.perf_counter()
+    matcher = BM25Matcher(
+        current_app.config.get('LEXICAL_MATCH_K1', 1.5),
+        current_app.config.get('LEXICAL_MATCH_B', 0.75)
+    )
+    scores = matcher.score(job.description_html, [candidate.cv_text for candidate in candidates])
+    for candidate, score in zip(candidates, scores):
+        candidate.lexical_match_score = round(float(score), 2)
+    db.session.commit()
+
+    current_app.logger.info(
+        "Lexically ranked %d applicant(s) for job %s in %.1fms",
+        len(candidates), job_id, (time.perf_counter() - started) * 1000
+    )
+    return len(candidates)
@@ -0,0 +1,142 @@
+import html
+import json
+import math
+import re
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to a character-based estimate
+    tiktoken = None
+
+# Per-field token budgets used when an AIPrompt row does not define token_budgets
+DEFAULT_TOKEN_BUDGETS = {
+    'generate_questions': {'job_description': 1500},
+    'analyze_cv': {'job_description': 800, 'cv_text': 1200},
+    'evaluate_answer': {'question_text': 200, 'answer_text': 700},
+    'evaluate_answers_batch': {'question': 150, 'answer': 500},
+    'personality_profile': {'cv_summary': 300, 'answers_text': 2500},
+}
+
+CHARS_PER_TOKEN = 4  # Rough English average when tiktoken is unavailable
+
+_TAG_RE = re.compile(r'<(br|/p|/div|/li|/h[1-6])\s*/?>', re.IGNORECASE)
+_ANY_TAG_RE = re.compile(r'<[^>]+>')
+_BOILERPLATE_RE = re.compile(
+    r'^(page \d+( of \d+)?|\d+ ?/ ?\d+|curriculum vitae|resume|references available upon request\.?)$',
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=16)
+def _encoding(model):
+    """Tokenizer for a model, or None (character estimate) when it cannot be loaded"""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model or 'gpt-4o-mini')
+        except KeyError:
+            return tiktoken.get_encoding('cl100k_base')
+    except Exception as e:
+        # The BPE file is downloaded on first use; offline hosts keep the estimate instead of failing
+        print(f"Tokenizer unavailable for {model}, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text, model=None):
+    """Token count for a model (estimated from length when tiktoken is not installed)"""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def compact_text(text):
+    """Strip markup, collapse whitespace and drop boilerplate or repeated lines"""
+    if not text:
+        return ''
+    text = _TAG_RE.sub('\n', text)
+    text = html.unescape(_ANY_TAG_RE.sub(' ', text))
+    lines = []
+    seen = set()
+    for line in text.splitlines():
+        line = ' '.join(line.split())
+        if not line or _BOILERPLATE_RE.match(line):
+            continue
+        key = line.lower()
+        if key in seen and len(line) > 3:
+            continue  # Repeated headers/footers from multi-page PDFs
+        seen.add(key)
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def truncate_to_tokens(text, budget, model=None):
+    """Cut text to at most budget tokens, preferring to end at a sentence or word boundary"""
+    if not text or budget is None or count_tokens(text, model) <= budget:
+        return text or ''
+    if budget <= 0:
+        return ''
+    encoding = _encoding(model)
+    if encoding is None:
+        cut = text[:budget * CHARS_PER_TOKEN]
+    else:
+        cut = encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+    boundary = max(cut.rfind('. '), cut.rfind('\n'))
+    if boundary < len(cut) * 0.8:
+        boundary = cut.rfind(' ')
+    if boundary > len(cut) * 0.5:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + ' …'
+
+
+def parse_budgets(value):
+    """Parse AIPrompt.token_budgets JSON into {field: int}; raises ValueError if malformed"""
+    if not value or not str(value).strip():
+        return {}
+    budgets = json.loads(value)
+    if not isinstance(budgets, dict):
+        raise ValueError("Token budgets must be a JSON object of field: tokens")
+    parsed = {}
+    for field, tokens in budgets.items():
+        if isinstance(tokens, bool) or not isinstance(tokens, (int, float)) or tokens < 0:
+            raise ValueError(f"Token budget for '{field}' must be a non-negative number")
+        parsed[str(field)] = int(tokens)
+    return parsed
+
+
+def budgets_for(prompt_key, prompt_budgets=None):
+    budgets = dict(DEFAULT_TOKEN_BUDGETS.get(prompt_key, {}))
+    budgets.update(prompt_budgets or {})
+    return budgets
+
+
+def fit_inputs(prompt_key, model=None, prompt_budgets=None, **fields):
+    """Compact every text field and truncate those with a budget; other values pass through"""
+    budgets = budgets_for(prompt_key, prompt_budgets)
+    fitted = {}
+    for name, value in fields.items():
+        if isinstance(value, str):
+            value = truncate_to_tokens(compact_text(value), budgets.get(name), model)
+        fitted[name] = value
+    return fitted
+
+
+def fit_items(texts, total_budget, model=None):
+    """Share a token budget across several texts; short ones donate their unused share to the rest"""
+    texts = [compact_text(text) for text in texts]
+    if total_budget is None or not texts:
+        return texts
+    sizes = [count_tokens(text, model) for text in texts]
+    remaining = total_budget
+    fitted = [None] * len(texts)
+    # Smallest first so leftover budget flows to the longest texts
+    order = sorted(range(len(texts)), key=lambda i: sizes[i])
+    for position, index in enumerate(order):
+        share = remaining // (len(texts) - position)
+        fitted[index] = truncate_to_tokens(texts[index], share, model)
+        remaining -= min(sizes[index], share)
+    return fitted
@@ -0,0 +1,120 @@
+import threading
+import time
+from string import Formatter
+from flask import current_app
+from app.models import AIPrompt, AIPromptVersion
+from app.services.prompt_budget import parse_budgets
+
+_formatter = Formatter()
+
+
+class CompiledPrompt:
+    """An AIPrompt row with its template parsed once"""
+
+    def __init__(self, prompt, version):
+        self.key = prompt.key
+        self.system_message = prompt.system_message
+        self.model = prompt.model
+        self.temperature = prompt.temperature
+        self.version = version
+        self.error = None
+        try:
+            self.parts = list(_formatter.parse(prompt.prompt_template or ''))
+        except ValueError as e:
+            self.parts = []
+            self.error = str(e)
+        self.fields = {field for _, field, _, _ in self.parts if field}
+        try:
+            self.token_budgets = parse_budgets(prompt.token_budgets)
+        except ValueError as e:
+            print(f"Ignoring invalid token budgets for prompt {prompt.key}: {e}")
+            self.token_budgets = {}
+
+    def render(self, **kwargs):
+        """Fill the template; raises KeyError/IndexError like str.format"""
+        chunks = []
+        for literal, field, spec, conversion in self.parts:
+            chunks.append(literal)
+            if field is None:
+                continue
+            value, _ = _formatter.get_field(field, (), kwargs)
+            value = _formatter.convert_field(value, conversion)
+            if spec and '{' in spec:
+                spec = _formatter.vformat(spec, (), kwargs)
+            chunks.append(_formatter.format_field(value, spec or ''))
+        return ''.join(chunks)
+
+
+class PromptRegistry:
+    """In-process cache of active AI prompts, invalidated by a shared version counter"""
+
+    def __init__(self, check_interval=5.0):
+        self.check_interval = check_interval
+        self._prompts = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _read_version(self):
+        from app import db
+
+        version = db.session.query(AIPromptVersion.version).filter_by(id=1).scalar()
+        return version or 0
+
+    def _load(self, version):
+        prompts = AIPrompt.query.filter_by(is_active=True).all()
+        self._prompts = {p.key: CompiledPrompt(p, version) for p in prompts}
+        self._version = version
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if self._version is not None and now - self._checked_at < self.check_interval:
+                return
+            version = self._read_version()
+            if version != self._version:
+                self._load(version)
+            self._checked_at = now
+
+    def get(self, key):
+        """Return the compiled prompt for key, or None if there is no active one"""
+        self._refresh()
+        return self._prompts.get(key)
+
+    @property
+    def version(self):
+        return self._version
+
+    def invalidate(self):
+        """Force a version check on the next lookup"""
+        self._checked_at = 0.0
+        self._version = None
+
+
+def init_prompt_registry(app):
+    """Create the app-scoped prompt registry"""
+    registry = PromptRegistry(app.config.get('PROMPT_CACHE_CHECK_INTERVAL', 5.0))
+    app.extensions['prompt_registry'] = registry
+    return registry
+
+
+def get_prompt_registry():
+    registry = current_app.extensions.get('prompt_registry')
+    if registry is None:
+        registry = init_prompt_registry(current_app._get_current_object())
+    return registry
+
+
+def bump_prompt_version():
+    """Increment the shared prompt version; call before committing a prompt change"""
+    from app import db
+
+    row = db.session.get(AIPromptVersion, 1, with_for_update=True)
+    if row is None:
+        row = AIPromptVersion(id=1, version=0)
+        db.session.add(row)
+    row.version = (row.version or 0) + 1
+    get_prompt_registry().invalidate()
+    return row.version
@@ -0,0 +1,258 @@
+import threading
+import time
+from flask import current_app
+from sqlalchemy import func
+from app import db, socketio
+from app.models import Application, Answer, Question
+from app.services.ai_service import (
+    NO_ANSWER_TEXT, TRANSCRIPTION_FAILED_TEXT, transcribe_audio, evaluate_answer,
+    evaluate_answers_batch, fast_path_score
+)
+from app.services.search_service import index_application
+from app.services.transcription_service import take_transcriber
+from app.utils.background import run_in_background
+
+# application_id -> {answer_id: BackgroundTask} for deferred scoring in this process
+_pending_tasks = {}
+_pending_lock = threading.Lock()
+
+
+def deferred_scoring_enabled():
+    return current_app.config.get('DEFERRED_SCORING', False)
+
+
+def batch_scoring_enabled(job):
+    """Jobs in batch mode score every answer with one LLM call at finalization"""
+    return bool(job) and job.scoring_mode == 'batch'
+
+
+def _apply_fast_path(answer, question, answer_text):
+    """Score the answer with the local rules if its job allows it and a rule matches"""
+    if not question.job or not question.job.fast_path_scoring:
+        return False
+    result = fast_path_score(question.text, answer_text, question.weightage)
+    if result is None:
+        return False
+    score, rule = result
+    answer.score = score
+    answer.score_status = 'scored'
+    answer.score_tier = 'rule'
+    current_app.logger.info("Answer %s scored by fast-path rule %s", answer.id, rule)
+    return True
+
+
+def _emit_transcript(sid, question_id, transcript):
+    if sid:
+        socketio.emit('transcript_received', {
+            'question_id': question_id,
+            'transcript': transcript
+        }, namespace='/interview', to=sid)
+
+
+def transcribe_answer(answer, sid=None):
+    """Fill answer.answer_text from its audio if the candidate did not type one"""
+    if answer.answer_text:
+        return answer.answer_text
+
+    text = ""
+    if answer.audio_path:
+        try:
+            # Segments transcribed during recording leave only the tail to do here
+            transcriber = take_transcriber(answer.application_id, answer.question_id)
+            if transcriber:
+                text = transcriber.finish(answer.audio_path)
+            else:
+                text = transcribe_audio(answer.audio_path)
+        except Exception as e:
+            print(f"Error transcribing audio: {e}")
+            text = TRANSCRIPTION_FAILED_TEXT
+        _emit_transcript(sid, answer.question_id, text)
+
+    if not text or text == TRANSCRIPTION_FAILED_TEXT:
+        text = NO_ANSWER_TEXT
+    answer.answer_text = text
+    return text
+
+
+def reconcile_total_score(application_id):
+    """Recompute Application.total_score from its stored answer scores"""
+    application = Application.query.get(application_id)
+    if not application:
+        return None
+    total = db.session.query(func.coalesce(func.sum(Answer.score), 0.0)).filter(
+        Answer.application_id == application_id
+    ).scalar()
+    application.total_score = float(total or 0.0)
+    return application.total_score
+
+
+def _claim_answer(answer_id):
+    """Move a pending answer to 'scoring'; True for the one task or worker whose update won"""
+    claimed = Answer.query.filter_by(id=answer_id, score_status='pending').update(
+        {'score_status': 'scoring'}, synchronize_session=False
+    )
+    db.session.commit()
+    return claimed == 1
+
+
+def _release_claim(answer_id):
+    """Put a claimed answer back to pending so a later pass can score it"""
+    Answer.query.filter_by(id=answer_id, score_status='scoring').update(
+        {'score_status': 'pending'}, synchronize_session=False
+    )
+    db.session.commit()
+
+
+def score_answer(answer_id, sid=None, claimed=False):
+    """
+    Transcribe (if needed) and evaluate a stored answer, then update the totals.
+    Unless the caller already claimed it, the answer is claimed first and skipped
+    (returning None) when another scorer holds it.
+    """
+    answer = Answer.query.get(answer_id)
+    if not answer:
+        return None
+    if answer.score_status == 'scored':
+        return answer.score
+    if not claimed and not _claim_answer(answer_id):
+        return None
+
+    try:
+        question = Question.query.get(answer.question_id)
+        answer_text = transcribe_answer(answer, sid)
+
+        if not _apply_fast_path(answer, question, answer_text):
+            try:
+                answer.score = evaluate_answer(question.text, answer_text, question.weightage)
+                answer.score_tier = 'llm'
+            except Exception as e:
+                print(f"Error evaluating answer: {e}")
+                answer.score = question.weightage * 0.5  # Default to 50%
+                answer.score_tier = 'default'
+            answer.score_status = 'scored'
+
+        reconcile_total_score(answer.application_id)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        _release_claim(answer_id)
+        raise
+    index_application(answer.application_id)
+    return answer.score
+
+
+def _score_in_background(answer_id, sid):
+    try:
+        return score_answer(answer_id, sid)
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("Deferred scoring failed for answer %s", answer_id)
+        raise
+
+
+def _track_task(answer, task):
+    with _pending_lock:
+        _pending_tasks.setdefault(answer.application_id, {})[answer.id] = task
+    return task
+
+
+def schedule_answer_scoring(answer, sid=None):
+    """Score a stored answer in a background task keyed by Answer.id"""
+    return _track_task(answer, run_in_background(_score_in_background, answer.id, sid))
+
+
+def _transcribe_in_background(answer_id, sid):
+    try:
+        answer = Answer.query.get(answer_id)
+        if answer and answer.score_status == 'pending':
+            transcribe_answer(answer, sid)
+            db.session.commit()
+            index_application(answer.application_id)
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("Transcription failed for answer %s", answer_id)
+        raise
+
+
+def schedule_answer_transcription(answer, sid=None):
+    """Transcribe a stored answer in the background, leaving it pending for batch scoring"""
+    return _track_task(answer, run_in_background(_transcribe_in_background, answer.id, sid))
+
+
+def score_answers_batch(answers, sid=None):
+    """Score pending answers with a single LLM call; returns the answers it could not score"""
+    if not answers:
+        return []
+    
+    application_id = answers[0].application_id
+    items = []
+    llm_answers = []
+    for answer in answers:
+        question = Question.query.get(answer.question_id)
+        answer_text = transcribe_answer(answer, sid)
+        # Trivial answers are scored locally and left out of the batch prompt
+        if _apply_fast_path(answer, question, answer_text):
+            continue
+        items.append({
+            'question': question.text,
+            'answer': answer_text,
+            'weightage': question.weightage
+        })
+        llm_answers.append(answer)
+    db.session.commit()  # Keep transcripts even if the evaluation call fails
+    
+    scores = evaluate_answers_batch(items) if items else []
+    unscored = []
+    for answer, score in zip(llm_answers, scores):
+        if score is None:
+            unscored.append(answer)
+            continue
+        answer.score = score
+        answer.score_status = 'scored'
+        answer.score_tier = 'llm_batch'
+    reconcile_total_score(application_id)
+    db.session.commit()
+    index_application(application_id)
+    return unscored
+
+
+def wait_for_scoring(application_id, timeout=None, sid=None, batch=False):
+    """Join outstanding scoring tasks, score anything still pending and reconcile totals"""
+    if timeout is None:
+        timeout = current_app.config.get('DEFERRED_SCORING_TIMEOUT', 60)
+    deadline = time.monotonic() + timeout
+
+    with _pending_lock:
+        tasks = _pending_tasks.pop(application_id, {})
+    for answer_id, task in tasks.items():
+        try:
+            task.result(max(0.0, deadline - time.monotonic()))
+        except Exception as e:
+            print(f"Deferred scoring for answer {answer_id} did not complete: {e}")
+    # A task still running past the deadline keeps its answer; it reconciles the totals when done
+    running = {answer_id for answer_id, task in tasks.items() if not task.done()}
+
+    # Answers whose task failed or never ran; claiming them skips any another worker is scoring
+    db.session.expire_all()
+    pending = [
+        answer for answer in Answer.query.filter_by(application_id=application_id, score_status='pending').all()
+        if answer.id not in running and _claim_answer(answer.id)
+    ]
+    if batch and pending:
+        try:
+            pending = score_answers_batch(pending, sid)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error batch scoring application {application_id}, scoring answers one by one: {e}")
+    # Answers the batch call left without a score fall back to one call each
+    for answer in pending:
+        try:
+            score_answer(answer.id, sid, claimed=True)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error scoring pending answer {answer.id}: {e}")
+
+    total = reconcile_total_score(application_id)
+    db.session.commit()
+    return total
+
@@ -0,0 +1,157 @@
+import math
+import re
+from datetime import datetime
+from flask import current_app
+from markupsafe import Markup, escape
+from sqlalchemy import func
+from app import db
+from app.models import Answer, Application, Job, Question, SearchDocument
+
+_WORD_RE = re.compile(r"[\w+#.]+", re.UNICODE)
+SNIPPET_RADIUS = 80
+
+
+def _use_postgres():
+    return db.engine.dialect.name == 'postgresql'
+
+
+def build_document(application):
+    """Concatenate the searchable text of an application into one document"""
+    candidate = application.candidate
+    sections = []
+    if candidate:
+        sections.append(f"{candidate.first_name} {candidate.last_name}")
+        if candidate.cv_summary:
+            sections.append(candidate.cv_summary)
+    answers = Answer.query.filter_by(application_id=application.id).join(Question).order_by(Question.order_index).all()
+    for answer in answers:
+        if answer.answer_text:
+            sections.append(answer.answer_text)
+    if application.personality_profile:
+        sections.append(application.personality_profile)
+    if application.interview_transcript:
+        sections.append(application.interview_transcript)
+    return "\n".join(sections)
+
+
+def index_application(application_id):
+    """Rebuild one application's search document; indexing failures never break the caller"""
+    try:
+        application = Application.query.get(application_id)
+        if not application:
+            return False
+        # Read everything before adding a new row: these queries autoflush the session
+        organization_id = application.job.organization_id
+        content = build_document(application)
+        document = SearchDocument.query.filter_by(application_id=application_id).first()
+        if document is None:
+            document = SearchDocument(
+                application_id=application_id,
+                organization_id=organization_id,
+                content=content
+            )
+            db.session.add(document)
+        document.organization_id = organization_id
+        document.content = content
+        document.updated_at = datetime.utcnow()
+        db.session.commit()
+        return True
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("Search indexing failed for application %s", application_id)
+        return False
+
+
+def rebuild_search_index(organization_id=None):
+    """Index every application (optionally of one organization); returns the number indexed"""
+    query = db.session.query(Application.id).join(Job)
+    if organization_id:
+        query = query.filter(Job.organization_id == organization_id)
+    count = 0
+    for (application_id,) in query.all():
+        if index_application(application_id):
+            count += 1
+    return count
+
+
+def query_terms(query):
+    return [term.strip('.') for term in _WORD_RE.findall((query or '').lower()) if term.strip('.')]
+
+
+def highlight(content, terms, radius=SNIPPET_RADIUS):
+    """HTML-safe excerpt around the first matching term with every term wrapped in <mark>"""
+    content = ' '.join((content or '').split())
+    lowered = content.lower()
+    positions = [lowered.find(term) for term in terms if lowered.find(term) >= 0]
+    start = max(0, min(positions) - radius) if positions else 0
+    end = min(len(content), start + radius * 3)
+    excerpt = content[start:end]
+    escaped = str(escape(excerpt))
+    for term in sorted(set(terms), key=len, reverse=True):
+        escaped = re.sub(
+            re.escape(str(escape(term))),
+            lambda match: f"<mark>{match.group(0)}</mark>",
+            escaped,
+            flags=re.IGNORECASE
+        )
+    prefix = '&hellip;' if start > 0 else ''
+    suffix = '&hellip;' if end < len(content) else ''
+    return Markup(prefix + escaped + suffix)
+
+
+def _search_postgres(organization_id, query, page, per_page):
+    vector = func.to_tsvector('english', SearchDocument.content)  # Matches the GIN index expression
+    tsquery = func.websearch_to_tsquery('english', query)
+    rank = func.ts_rank_cd(vector, tsquery).label('rank')
+    base = db.session.query(SearchDocument, rank).filter(
+        SearchDocument.organization_id == organization_id,
+        vector.op('@@')(tsquery)
+    )
+    total = base.count()
+    rows = base.order_by(rank.desc(), SearchDocument.updated_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    return rows, total
+
+
+def _search_local(organization_id, query, page, per_page):
+    # Portable fallback (SQLite/tests): every term must appear; rank by log-scaled term frequency
+    terms = query_terms(query)
+    if not terms:
+        return [], 0
+    base = SearchDocument.query.filter(SearchDocument.organization_id == organization_id)
+    for term in terms:
+        base = base.filter(SearchDocument.content.ilike(f"%{term}%"))
+    scored = []
+    for document in base.all():
+        lowered = (document.content or '').lower()
+        length = max(1, len(lowered.split()))
+        score = sum(1.0 + math.log(lowered.count(term)) for term in terms if term in lowered)
+        scored.append((document, score / math.log(length + 1.0)))
+    scored.sort(key=lambda item: (item[1], item[0].updated_at or datetime.min), reverse=True)
+    start = (page - 1) * per_page
+    return scored[start:start + per_page], len(scored)
+
+
+def search_applications(organization_id, query, page=1, per_page=20):
+    """
+    Ranked full-text search over an organization's applications.
+    Returns (results, total) where each result is a dict with application, rank and snippet.
+    """
+    query = (query or '').strip()
+    if not query:
+        return [], 0
+    page = max(page, 1)
+
+    if _use_postgres():
+        rows, total = _search_postgres(organization_id, query, page, per_page)
+    else:
+        rows, total = _search_local(organization_id, query, page, per_page)
+
+    terms = query_terms(query)
+    results = []
+    for document, rank in rows:
+        results.append({
+            'application': Application.query.get(document.application_id),
+            'rank': float(rank or 0.0),
+            'snippet': highlight(document.content, terms)
+        })
+    return [result for result in results if result['application']], total
@@ -0,0 +1,146 @@
+import json
+import threading
+import time
+from flask import current_app
+
+try:
+    import redis
+except ImportError:  # Only needed for redis:// session stores
+    redis = None
+
+
+class SessionStoreError(Exception):
+    """Raised when the configured session store cannot be created or a session cannot be updated"""
+
+
+class MemorySessionStore:
+    """
+    Process-local store (single worker or tests); values round-trip through JSON like Redis.
+    Writes to an existing session go through update(), which applies a mutation atomically.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+        return json.loads(value)
+
+    def save(self, key, data):
+        value = json.dumps(data)
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key):
+        with self._lock:
+            item = self._data.pop(key, None)
+        if item is None or item[0] < time.monotonic():
+            return None
+        return json.loads(item[1])
+
+    def update(self, key, mutate):
+        """
+        Apply mutate(data) to the stored document and write it back atomically.
+        Returns the resulting document, or None when the key no longer exists (nothing is
+        written); mutate may return False to leave the document unchanged.
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                self._data.pop(key, None)
+                return None
+            data = json.loads(item[1])
+            if mutate(data) is False:
+                return json.loads(item[1])
+            self._data[key] = (time.monotonic() + self.ttl, json.dumps(data))
+        return data
+
+
+class RedisSessionStore:
+    """Session state in Redis so any worker or node can serve an interview's events"""
+
+    def __init__(self, client, ttl, prefix='interview:session:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value else None
+
+    def save(self, key, data):
+        self.client.set(self.prefix + key, json.dumps(data), ex=self.ttl)
+
+    def pop(self, key):
+        pipe = self.client.pipeline()
+        pipe.get(self.prefix + key)
+        pipe.delete(self.prefix + key)
+        value, _ = pipe.execute()
+        return json.loads(value) if value else None
+
+    def update(self, key, mutate, retries=10):
+        """Optimistic WATCH/MULTI read-modify-write; same contract as MemorySessionStore.update"""
+        name = self.prefix + key
+        with self.client.pipeline() as pipe:
+            for _ in range(retries):
+                try:
+                    pipe.watch(name)
+                    value = pipe.get(name)
+                    if not value:
+                        pipe.unwatch()
+                        return None
+                    data = json.loads(value)
+                    if mutate(data) is False:
+                        pipe.unwatch()
+                        return json.loads(value)
+                    pipe.multi()
+                    pipe.set(name, json.dumps(data), ex=self.ttl)
+                    pipe.execute()
+                    return data
+                except redis.WatchError:
+                    continue  # Another worker wrote the session first; re-apply on its version
+        raise SessionStoreError(f"Session {key} kept changing, update abandoned")
+
+
+def create_session_store(url, ttl):
+    """Build a store from a URL: memory://, fakeredis:// (tests) or redis://host:port/db"""
+    url = (url or 'memory://').strip()
+    if url.startswith('memory://'):
+        return MemorySessionStore(ttl)
+    if url.startswith('fakeredis://'):
+        try:
+            import fakeredis
+        except ImportError:
+            raise SessionStoreError("fakeredis:// session store requires the fakeredis package")
+        return RedisSessionStore(fakeredis.FakeRedis(), ttl)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        if redis is None:
+            raise SessionStoreError("Redis session store requires the redis package")
+        return RedisSessionStore(redis.Redis.from_url(url), ttl)
+    raise SessionStoreError(f"Unsupported session store URL: {url}")
+
+
+def init_session_store(app):
+    """Create the app-scoped interview session store"""
+    store = create_session_store(
+        app.config.get('SESSION_STORE_URL', 'memory://'),
+        app.config.get('INTERVIEW_SESSION_TTL', 10800)
+    )
+    app.extensions['session_store'] = store
+    return store
+
+
+def get_session_store():
+    store = current_app.extensions.get('session_store')
+    if store is None:
+        store = init_session_store(current_app._get_current_object())
+    return store
@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+from flask import current_app
+from app.models import Question
+from app.services.ai_service import generate_speech
+from app.utils.background import run_in_background
+
+
+def _render_question_speech(question_id):
+    question = Question.query.get(question_id)
+    if not question:
+        return None
+    return generate_speech(question.text)
+
+
+class SpeechPrefetcher:
+    """Bounded per-session buffer of question audio rendered ahead of time"""
+
+    def __init__(self, depth):
+        self.depth = depth
+        self._tasks = OrderedDict()  # question_id -> BackgroundTask
+        self._lock = threading.Lock()
+
+    def prefetch(self, question_ids):
+        """Start rendering the next `depth` questions that are not buffered yet"""
+        wanted = list(question_ids)[:self.depth]
+        with self._lock:
+            # Drop anything no longer upcoming (e.g. after a skip)
+            for question_id in list(self._tasks):
+                if question_id not in wanted:
+                    self._tasks.pop(question_id).cancel()
+            for question_id in wanted:
+                if question_id not in self._tasks:
+                    self._tasks[question_id] = run_in_background(_render_question_speech, question_id)
+
+    def take(self, question_id, timeout=None):
+        """Return prefetched audio for a question, or None if it was not prefetched or failed"""
+        with self._lock:
+            task = self._tasks.pop(question_id, None)
+        if task is None:
+            return None
+        try:
+            return task.result(timeout)
+        except Exception as e:
+            print(f"Prefetched speech unavailable for question {question_id}: {e}")
+            task.cancel()
+            return None
+
+    def clear(self):
+        with self._lock:
+            tasks = list(self._tasks.values())
+            self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+
+
+# sid -> SpeechPrefetcher
+_prefetchers = {}
+_prefetchers_lock = threading.Lock()
+
+
+def get_prefetcher(sid):
+    """Get (or create) the prefetcher for a socket session; None when prefetch is disabled"""
+    depth = current_app.config.get('TTS_PREFETCH_DEPTH', 2)
+    if depth <= 0:
+        return None
+    with _prefetchers_lock:
+        prefetcher = _prefetchers.get(sid)
+        if prefetcher is None:
+            prefetcher = SpeechPrefetcher(depth)
+            _prefetchers[sid] = prefetcher
+    return prefetcher
+
+
+def release_prefetcher(sid):
+    """Free a session's buffered audio"""
+    with _prefetchers_lock:
+        prefetcher = _prefetchers.pop(sid, None)
+    if prefetcher:
+        prefetcher.clear()
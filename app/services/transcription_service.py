@@ -0,0 +1,175 @@
+import os
+import threading
+import uuid
+from flask import current_app
+from app.services.ai_service import transcribe_audio, transcribe_audio_bytes
+from app.services.voice_service import extract_audio_segment, get_spool_path
+from app.utils.background import run_in_background
+
+# Audio past a segment's end that must be spooled before the segment is cut
+SEGMENT_SLACK_SECONDS = 1.0
+
+
+def _transcribe_segment(source_path, start, duration, previous_task):
+    # Segments run in order so each one can use the previous text as its Whisper prompt
+    previous_text = None
+    if previous_task is not None:
+        try:
+            previous_text = previous_task.result(current_app.config.get('TRANSCRIBE_SEGMENT_TIMEOUT', 60))
+        except Exception:
+            previous_text = None
+    audio_bytes = extract_audio_segment(source_path, start, duration)
+    if not audio_bytes:
+        return ""
+    return transcribe_audio_bytes(audio_bytes, prompt=previous_text)
+
+
+class RollingTranscriber:
+    """Transcribes completed segments of a spooled recording while the candidate is still speaking"""
+
+    def __init__(self, application_id, question_id, segment_seconds):
+        self.application_id = application_id
+        self.question_id = question_id
+        self.segment_seconds = segment_seconds
+        self.boundary = 0.0  # seconds of audio already handed to a segment task
+        self.tasks = []
+        self.finish_task = None
+
+    def on_progress(self, recorded_seconds):
+        """Schedule every segment whose audio has fully reached the spool (recorded_seconds = audio received, not wall time)"""
+        if self.segment_seconds <= 0:
+            return
+        spool_path = get_spool_path(self.application_id, self.question_id)
+        while recorded_seconds - self.boundary >= self.segment_seconds + SEGMENT_SLACK_SECONDS:
+            previous_task = self.tasks[-1][1] if self.tasks else None
+            task = run_in_background(
+                _transcribe_segment, spool_path, self.boundary, self.segment_seconds, previous_task
+            )
+            self.tasks.append((self.boundary, task))
+            self.boundary += self.segment_seconds
+
+    def start_finish(self, spool_path):
+        """Start the final join/tail transcription from the spool while it is being compressed"""
+        self.cancel_finish()
+        # A hard link keeps the recording readable after the spool is consumed (O(1), no copy)
+        link_path = f"{spool_path}.{uuid.uuid4().hex}.tx"
+        try:
+            os.link(spool_path, link_path)
+        except OSError as e:
+            print(f"Cannot overlap transcription with compression: {e}")
+            return
+        self.finish_task = run_in_background(self._finish_from_link, link_path)
+
+    def _finish_from_link(self, link_path):
+        try:
+            return self._join(link_path)
+        finally:
+            try:
+                os.remove(link_path)
+            except OSError:
+                pass
+
+    def _join(self, source_path):
+        """Collect segment texts (re-cutting failed ones from source_path) and transcribe the tail"""
+        timeout = current_app.config.get('TRANSCRIBE_SEGMENT_TIMEOUT', 60)
+        texts = []
+        for start, task in self.tasks:
+            try:
+                text = task.result(timeout)
+            except Exception as e:
+                # e.g. the task started after the spool was consumed
+                print(f"Segment at {start}s failed ({e}), re-cutting it from the final file")
+                segment = extract_audio_segment(source_path, start, self.segment_seconds)
+                text = transcribe_audio_bytes(segment, prompt=' '.join(texts)) if segment else ""
+            texts.append(text)
+        tail = extract_audio_segment(source_path, self.boundary)
+        if tail:
+            texts.append(transcribe_audio_bytes(tail, prompt=' '.join(texts)))
+        return ' '.join(text.strip() for text in texts if text and text.strip())
+
+    def finish(self, audio_path):
+        """Return the full transcript, transcribing whatever was not done during recording"""
+        if self.finish_task is not None:
+            try:
+                return self.finish_task.result(current_app.config.get('TRANSCRIBE_SEGMENT_TIMEOUT', 60))
+            except Exception as e:
+                print(f"Overlapped transcription failed, retrying from the stored file: {e}")
+
+        full_path = os.path.join(current_app.root_path, 'static', audio_path)
+        try:
+            return self._join(full_path)
+        except Exception as e:
+            print(f"Incremental transcription failed, transcribing full answer: {e}")
+            self.cancel()
+            return transcribe_audio(audio_path)
+
+    def cancel_finish(self):
+        """Stop the overlapped final pass (e.g. the submission was rejected and will be retried)"""
+        if self.finish_task is not None:
+            self.finish_task.cancel()
+        self.finish_task = None
+
+    def cancel(self):
+        for _, task in self.tasks:
+            task.cancel()
+        self.tasks = []
+        self.cancel_finish()
+
+
+class UploadTranscription:
+    """Transcription of a whole uploaded answer, started while the audio is being compressed"""
+
+    def __init__(self, audio_bytes, filename):
+        self.task = run_in_background(transcribe_audio_bytes, audio_bytes, filename)
+
+    def finish(self, audio_path):
+        try:
+            return self.task.result(current_app.config.get('TRANSCRIBE_SEGMENT_TIMEOUT', 60))
+        except Exception as e:
+            print(f"Upload transcription failed, retrying from the stored file: {e}")
+            return transcribe_audio(audio_path)
+
+    def cancel(self):
+        self.task.cancel()
+
+
+# (application_id, question_id) -> RollingTranscriber/UploadTranscription awaiting scoring
+_transcribers = {}
+_transcribers_lock = threading.Lock()
+
+
+def start_transcriber(application_id, question_id):
+    """Begin tracking transcription for a new chunked recording"""
+    discard_transcriber(application_id, question_id)
+    # With segments disabled the transcriber still overlaps the final pass with compression
+    segment_seconds = max(0.0, current_app.config.get('TRANSCRIBE_SEGMENT_SECONDS', 15))
+    transcriber = RollingTranscriber(application_id, question_id, segment_seconds)
+    with _transcribers_lock:
+        _transcribers[(application_id, question_id)] = transcriber
+    return transcriber
+
+
+def start_upload_transcription(application_id, question_id, audio_bytes, filename="answer.webm"):
+    """Transcribe a single-message upload from memory in parallel with its compression"""
+    discard_transcriber(application_id, question_id)
+    transcription = UploadTranscription(audio_bytes, filename)
+    with _transcribers_lock:
+        _transcribers[(application_id, question_id)] = transcription
+    return transcription
+
+
+def get_transcriber(application_id, question_id):
+    with _transcribers_lock:
+        return _transcribers.get((application_id, question_id))
+
+
+def take_transcriber(application_id, question_id):
+    """Remove and return the transcriber for a submitted answer"""
+    with _transcribers_lock:
+        return _transcribers.pop((application_id, question_id), None)
+
+
+def discard_transcriber(application_id, question_id):
+    transcriber = take_transcriber(application_id, question_id)
+    if transcriber:
+        transcriber.cancel()
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import threading
+import uuid
+from flask import current_app
+
+
+class TTSCache:
+    """Content-addressed on-disk cache of generated speech with size-based LRU eviction"""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = self._scan_size()
+
+    @staticmethod
+    def key(text, model, voice, fmt):
+        digest = hashlib.sha256()
+        for part in (model, voice, fmt, text or ''):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def get(self, key):
+        """Return cached bytes (refreshing the entry's LRU position) or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path, None)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        if not data:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            try:
+                replaced = os.path.getsize(path)  # Overwriting an entry only changes the size by the difference
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing TTS cache entry: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._size = max(0, self._size - replaced) + len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Other workers share the directory, so re-read the real size before evicting
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        target = int(self.max_bytes * 0.9)
+        for path, entry_size, _ in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+                size -= entry_size
+                self.evictions += 1
+            except OSError:
+                pass
+        self._size = size
+
+    def invalidate(self, key):
+        path = self._path(key)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return False
+        with self._lock:
+            self._size = max(0, self._size - size)
+        return True
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            'evictions': self.evictions,
+            'size_bytes': self._size,
+            'max_bytes': self.max_bytes
+        }
+
+
+def init_tts_cache(app):
+    """Create the app-scoped TTS cache under UPLOAD_FOLDER"""
+    directory = os.path.join(app.config['UPLOAD_FOLDER'], 'tts_cache')
+    cache = TTSCache(directory, app.config.get('TTS_CACHE_MAX_BYTES', 500 * 1024 * 1024))
+    app.extensions['tts_cache'] = cache
+    return cache
+
+
+def get_tts_cache():
+    """Return the TTS cache, or None when it is disabled"""
+    if not current_app.config.get('TTS_CACHE_ENABLED', True):
+        return None
+    cache = current_app.extensions.get('tts_cache')
+    if cache is None:
+        cache = init_tts_cache(current_app._get_current_object())
+    return cache
@@ -1,91 +1,348 @@
 import os
 import base64
+import subprocess
+import tempfile
+import threading
+import time
 from datetime import datetime
 from flask import current_app
 from pydub import AudioSegment
+from app.services.audio_pool import AudioPoolSaturated, run_audio_job
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+def decode_audio_data(audio_data):
+    """Return raw audio bytes from a binary Socket.IO attachment or a base64 (data URL) string"""
+    if isinstance(audio_data, bytes):
+        return audio_data
+    if isinstance(audio_data, (bytearray, memoryview)):
+        return bytes(audio_data)
+    
+    if ',' in audio_data:
+        # Remove data URL prefix if present
+        audio_data = audio_data.split(',', 1)[1]
+    return base64.b64decode(audio_data)
+
+def _interviews_folder():
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], 'interviews')
+
+def _audio_filenames(application_id, question_id):
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    base = f"app_{application_id}_q_{question_id}_{timestamp}"
+    return f"{base}.webm", f"{base}.mp3"
 
 def save_audio_file(audio_data, application_id, question_id):
-    """Save and compress audio file from base64 data"""
+    """Save and compress audio file from raw bytes or base64 data"""
     try:
-        # Decode base64 audio data
-        if ',' in audio_data:
-            # Remove data URL prefix if present
-            audio_data = audio_data.split(',')[1]
-        
-        audio_bytes = base64.b64decode(audio_data)
+        audio_bytes = decode_audio_data(audio_data)
         
         # Create filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        original_filename = f"app_{application_id}_q_{question_id}_{timestamp}.webm"
-        compressed_filename = f"app_{application_id}_q_{question_id}_{timestamp}.mp3"
+        original_filename, compressed_filename = _audio_filenames(application_id, question_id)
+        
+        if _transcode_mode() == 'pipe':
+            # Bytes go straight into ffmpeg; no temporary WebM on disk
+            return store_transcoded_audio(original_filename, compressed_filename, audio_bytes=audio_bytes)
         
-        # Full path
-        upload_folder = current_app.config['UPLOAD_FOLDER']
-        original_path = os.path.join(upload_folder, 'interviews', original_filename)
-        compressed_path = os.path.join(upload_folder, 'interviews', compressed_filename)
+        original_path = os.path.join(_interviews_folder(), original_filename)
         
         # Save original file temporarily
         with open(original_path, 'wb') as f:
             f.write(audio_bytes)
         
-        # Compress audio using pydub (requires ffmpeg)
         try:
-            # Load audio from WebM format
-            audio = AudioSegment.from_file(original_path, format="webm")
-            
-            # Normalize audio (helps with consistent volume)
-            audio = audio.normalize()
-            
-            # Export as MP3 with optimized settings for speech
-            # These settings provide good quality for speech while reducing file size significantly
-            # - Bitrate: 64kbps is optimal for speech (saves ~70-80% space vs original)
-            # - Sample rate: 22050 Hz is sufficient for speech (reduces file size)
-            # - Mono: Speech doesn't need stereo, saves space
-            audio.export(
-                compressed_path,
-                format="mp3",
-                bitrate="64k",  # 64kbps for speech - good balance of quality and size
-                parameters=[
-                    "-ar", "22050",  # Sample rate: 22.05kHz (sufficient for speech)
-                    "-ac", "1",      # Mono channel (speech doesn't need stereo)
-                    "-q:a", "2"      # Quality setting (0-9, lower is better quality)
-                ]
-            )
-            
-            # Verify compressed file was created and has size
-            if os.path.exists(compressed_path) and os.path.getsize(compressed_path) > 0:
-                # Remove original WebM file to save space
+            return compress_audio_file(original_filename, compressed_filename)
+        except AudioPoolSaturated:
+            os.remove(original_path)  # The client resubmits the whole answer
+            raise
+        
+    except AudioPoolSaturated:
+        raise
+    except Exception as e:
+        print(f"Error saving audio file: {e}")
+        return None
+
+def _transcode_mode():
+    return current_app.config.get('AUDIO_TRANSCODE_MODE', 'pipe')
+
+def _finish_output(partial_path, output_path, deadline):
+    """Move a finished transcode into place unless the caller has already given up on it"""
+    if deadline and time.time() > deadline:
+        os.remove(partial_path)
+        raise TimeoutError("Audio job finished after its deadline")
+    os.replace(partial_path, output_path)
+
+def transcode_to_mp3(output_path, input_bytes=None, input_path=None, ffmpeg='ffmpeg', measure_rss=False,
+                     deadline=None):
+    """
+    Transcode answer audio to speech-optimized MP3 with a single ffmpeg process.
+    Input is piped from memory or read from input_path; loudness normalization happens
+    inside ffmpeg so no decoded PCM is held in Python. Returns timing stats, plus this run's
+    peak memory with measure_rss (pool workers only: the blocking wait4 would stall the server).
+    ffmpeg is killed once deadline passes; output only appears at output_path when it finished in time.
+    """
+    if deadline and time.time() >= deadline:
+        raise TimeoutError("Audio job expired before it started")
+    partial_path = output_path + '.part'
+    command = [
+        ffmpeg, '-hide_banner', '-loglevel', 'error', '-y',
+        '-i', input_path or 'pipe:0',
+        '-vn',
+        '-af', 'loudnorm=I=-16:TP=-1.5:LRA=11',  # Consistent speech loudness
+        '-ar', '22050',  # Sample rate: 22.05kHz (sufficient for speech)
+        '-ac', '1',      # Mono channel (speech doesn't need stereo)
+        '-b:a', '64k',   # 64kbps for speech - good balance of quality and size
+        '-f', 'mp3',
+        partial_path
+    ]
+    
+    started = time.perf_counter()
+    peak_rss_kb = None
+    # stderr goes to a file, so feeding stdin can never deadlock on an unread pipe
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE if input_bytes is not None else subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr
+        )
+        timer = None
+        if deadline:
+            timer = threading.Timer(max(0.0, deadline - time.time()), process.kill)
+            timer.daemon = True
+            timer.start()
+        if input_bytes is not None:
+            try:
+                process.stdin.write(input_bytes)
+            except BrokenPipeError:
+                pass  # ffmpeg exited early; its exit status and stderr say why
+            finally:
                 try:
-                    os.remove(original_path)
-                except OSError:
-                    pass  # Continue if deletion fails
-                
-                # Return relative path for compressed file
-                return os.path.join('uploads', 'interviews', compressed_filename)
-            else:
-                # Compressed file not created properly, keep original
-                print("Compressed file not created properly, using original")
-                return os.path.join('uploads', 'interviews', original_filename)
-            
-        except Exception as compress_error:
-            # If compression fails (e.g., ffmpeg not installed), keep original file
-            print(f"Error compressing audio: {compress_error}")
-            print("Falling back to original WebM file. Make sure ffmpeg is installed.")
-            # Remove compressed file if it exists but is invalid
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+        if measure_rss and resource is not None and hasattr(os, 'wait4'):
+            # Reaping the child ourselves yields the rusage of this ffmpeg run alone
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            peak_rss_kb = usage.ru_maxrss
+        else:
+            process.wait()
+        if timer:
+            timer.cancel()
+        stderr.seek(0)
+        errors = stderr.read()
+    elapsed = time.perf_counter() - started
+    
+    if process.returncode != 0 or not os.path.exists(partial_path) or os.path.getsize(partial_path) == 0:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        if deadline and time.time() >= deadline:
+            raise TimeoutError("ffmpeg killed at the audio job deadline")
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg exited with {process.returncode}: {errors.decode(errors='ignore').strip()}")
+        raise RuntimeError("ffmpeg produced no output")
+    _finish_output(partial_path, output_path, deadline)
+    
+    return {
+        'seconds': elapsed,
+        'ffmpeg_peak_rss_kb': peak_rss_kb,
+        'input_bytes': len(input_bytes) if input_bytes is not None else os.path.getsize(input_path),
+        'output_bytes': os.path.getsize(output_path)
+    }
+
+def store_transcoded_audio(original_filename, compressed_filename, audio_bytes=None, source_path=None):
+    """Transcode to MP3 in one piped pass; the original WebM is only kept if that fails"""
+    compressed_path = os.path.join(_interviews_folder(), compressed_filename)
+    try:
+        # Runs in the audio worker pool; raises AudioPoolSaturated when its queue is full
+        stats = run_audio_job(
+            transcode_to_mp3,
+            compressed_path,
+            input_bytes=audio_bytes,
+            input_path=source_path,
+            ffmpeg=current_app.config.get('FFMPEG_BINARY', 'ffmpeg'),
+            measure_rss=current_app.extensions.get('audio_pool') is not None
+        )
+        if stats['ffmpeg_peak_rss_kb'] is not None:
+            current_app.logger.info(
+                "Transcoded %s in %.2fs (ffmpeg peak RSS %d KB, %d -> %d bytes)",
+                compressed_filename, stats['seconds'], stats['ffmpeg_peak_rss_kb'],
+                stats['input_bytes'], stats['output_bytes']
+            )
+        else:
+            current_app.logger.info(
+                "Transcoded %s in %.2fs (%d -> %d bytes)",
+                compressed_filename, stats['seconds'], stats['input_bytes'], stats['output_bytes']
+            )
+        if source_path:
             try:
-                if os.path.exists(compressed_path):
-                    os.remove(compressed_path)
+                os.remove(source_path)
             except OSError:
                 pass
+        return os.path.join('uploads', 'interviews', compressed_filename)
+        
+    except AudioPoolSaturated:
+        raise
+    except Exception as transcode_error:
+        # If compression fails (e.g., ffmpeg not installed), keep original file
+        print(f"Error compressing audio: {transcode_error}")
+        print("Falling back to original WebM file. Make sure ffmpeg is installed.")
+        try:
+            if os.path.exists(compressed_path):
+                os.remove(compressed_path)
+        except OSError:
+            pass
+        original_path = os.path.join(_interviews_folder(), original_filename)
+        if source_path:
+            os.replace(source_path, original_path)
+        else:
+            with open(original_path, 'wb') as f:
+                f.write(audio_bytes)
+        return os.path.join('uploads', 'interviews', original_filename)
+
+def pydub_transcode(original_path, compressed_path, deadline=None):
+    """Decode, normalize and export a WebM answer as MP3 with pydub (runs in the audio worker pool)"""
+    if deadline and time.time() >= deadline:
+        raise TimeoutError("Audio job expired before it started")
+    partial_path = compressed_path + '.part'
+    # Load audio from WebM format
+    audio = AudioSegment.from_file(original_path, format="webm")
+    
+    # Normalize audio (helps with consistent volume)
+    audio = audio.normalize()
+    
+    # Export as MP3 with optimized settings for speech
+    # These settings provide good quality for speech while reducing file size significantly
+    # - Bitrate: 64kbps is optimal for speech (saves ~70-80% space vs original)
+    # - Sample rate: 22050 Hz is sufficient for speech (reduces file size)
+    # - Mono: Speech doesn't need stereo, saves space
+    try:
+        audio.export(
+            partial_path,
+            format="mp3",
+            bitrate="64k",  # 64kbps for speech - good balance of quality and size
+            parameters=[
+                "-ar", "22050",  # Sample rate: 22.05kHz (sufficient for speech)
+                "-ac", "1",      # Mono channel (speech doesn't need stereo)
+                "-q:a", "2"      # Quality setting (0-9, lower is better quality)
+            ]
+        ).close()
+    except Exception:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    _finish_output(partial_path, compressed_path, deadline)
+
+def compress_audio_file(original_filename, compressed_filename):
+    """Compress a stored WebM answer to MP3 and return the relative path of the kept file"""
+    original_path = os.path.join(_interviews_folder(), original_filename)
+    compressed_path = os.path.join(_interviews_folder(), compressed_filename)
+    
+    # Compress audio using pydub (requires ffmpeg)
+    try:
+        run_audio_job(pydub_transcode, original_path, compressed_path)
+        
+        # Verify compressed file was created and has size
+        if os.path.exists(compressed_path) and os.path.getsize(compressed_path) > 0:
+            # Remove original WebM file to save space
+            try:
+                os.remove(original_path)
+            except OSError:
+                pass  # Continue if deletion fails
+            
+            # Return relative path for compressed file
+            return os.path.join('uploads', 'interviews', compressed_filename)
+        else:
+            # Compressed file not created properly, keep original
+            print("Compressed file not created properly, using original")
             return os.path.join('uploads', 'interviews', original_filename)
         
-    except Exception as e:
-        print(f"Error saving audio file: {e}")
-        return None
+    except AudioPoolSaturated:
+        raise
+    except Exception as compress_error:
+        # If compression fails (e.g., ffmpeg not installed), keep original file
+        print(f"Error compressing audio: {compress_error}")
+        print("Falling back to original WebM file. Make sure ffmpeg is installed.")
+        # Remove compressed file if it exists but is invalid
+        try:
+            if os.path.exists(compressed_path):
+                os.remove(compressed_path)
+        except OSError:
+            pass
+        return os.path.join('uploads', 'interviews', original_filename)
+
+def extract_audio_segment(source_path, start, duration=None):
+    """Cut [start, start + duration) seconds out of an audio file as small mono MP3 bytes"""
+    command = [
+        current_app.config.get('FFMPEG_BINARY', 'ffmpeg'),
+        '-hide_banner', '-loglevel', 'error',
+        '-i', source_path,
+        '-ss', f"{start:.3f}"
+    ]
+    if duration is not None:
+        command += ['-t', f"{duration:.3f}"]
+    command += ['-vn', '-ac', '1', '-ar', '16000', '-b:a', '48k', '-f', 'mp3', 'pipe:1']
+    
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg segment extraction failed: {result.stderr.decode(errors='ignore').strip()}")
+    return result.stdout
+
+class AudioSpoolError(Exception):
+    """Raised when a chunked upload cannot be accepted"""
 
-def process_audio_chunk(audio_chunk, sample_rate=16000):
-    """Process audio chunk for streaming (if needed)"""
-    # This function can be expanded for real-time audio processing
-    # For now, it's a placeholder
-    return audio_chunk
+def get_spool_path(application_id, question_id):
+    """Spool file that collects an answer's chunks while the candidate is recording"""
+    spool_folder = os.path.join(_interviews_folder(), 'spool')
+    os.makedirs(spool_folder, exist_ok=True)
+    return os.path.join(spool_folder, f"app_{application_id}_q_{question_id}.webm.part")
 
+def append_audio_chunk(application_id, question_id, audio_chunk, current_size=0):
+    """Append one recorded chunk to the answer's spool file and return the new size"""
+    audio_bytes = decode_audio_data(audio_chunk)
+    new_size = current_size + len(audio_bytes)
+    if new_size > current_app.config['MAX_UPLOAD_SIZE']:
+        raise AudioSpoolError("Recording exceeds the maximum upload size")
+    
+    with open(get_spool_path(application_id, question_id), 'ab') as f:
+        f.write(audio_bytes)
+    return new_size
+
+def discard_audio_spool(application_id, question_id):
+    """Remove a partial upload (new recording, skip or disconnect)"""
+    try:
+        os.remove(get_spool_path(application_id, question_id))
+    except OSError:
+        pass
+
+def save_spooled_audio(application_id, question_id):
+    """Finalize a chunked upload from its spool file and compress it"""
+    try:
+        spool_path = get_spool_path(application_id, question_id)
+        if not os.path.exists(spool_path) or os.path.getsize(spool_path) == 0:
+            return None
+        
+        original_filename, compressed_filename = _audio_filenames(application_id, question_id)
+        
+        if _transcode_mode() == 'pipe':
+            # ffmpeg reads the spool directly; it is renamed into place only if transcoding fails
+            return store_transcoded_audio(original_filename, compressed_filename, source_path=spool_path)
+        
+        # Same filesystem, so this is an O(1) rename rather than a copy
+        original_path = os.path.join(_interviews_folder(), original_filename)
+        os.replace(spool_path, original_path)
+        
+        try:
+            return compress_audio_file(original_filename, compressed_filename)
+        except AudioPoolSaturated:
+            os.replace(original_path, spool_path)  # Keep the chunks for the client's retry
+            raise
+        
+    except AudioPoolSaturated:
+        raise
+    except Exception as e:
+        print(f"Error saving spooled audio file: {e}")
+        return None
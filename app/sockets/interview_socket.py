@@ -1,16 +1,31 @@
-from flask_socketio import emit, join_room, leave_room
-from flask import request
+from flask_socketio import emit, join_room, leave_room, close_room
+from flask import request, current_app
 from app import socketio, db
 from app.models import Application, Answer, Question
-from app.services.ai_service import transcribe_audio, evaluate_answer, generate_personality_profile, generate_speech
+from app.services.ai_service import generate_personality_profile, generate_speech, stream_speech
+from app.services.scoring_service import (
+    NO_ANSWER_TEXT, deferred_scoring_enabled, batch_scoring_enabled, score_answer,
+    schedule_answer_scoring, schedule_answer_transcription, wait_for_scoring
+)
 from app.services.email_service import send_interview_completion_email
-from app.services.voice_service import save_audio_file
+from app.services.search_service import index_application
+from app.services.voice_service import (
+    save_audio_file, save_spooled_audio, append_audio_chunk, discard_audio_spool, get_spool_path,
+    decode_audio_data, AudioSpoolError
+)
+from app.services.audio_pool import AudioPoolSaturated
+from app.services.session_store import get_session_store
+from app.services.speech_prefetch import get_prefetcher, release_prefetcher
+from app.services.transcription_service import (
+    start_transcriber, start_upload_transcription, get_transcriber, discard_transcriber
+)
 from datetime import datetime
+import hmac
 import random
+import secrets
 import base64
 
-# Store active interview sessions
-active_sessions = {}
+COMPLETION_MESSAGE = 'Thank you for completing the interview! Our team will review your application and reach out if we move forward together.'
 
 @socketio.on('connect', namespace='/interview')
 def handle_connect():
@@ -22,12 +37,25 @@ def handle_connect():
 def handle_disconnect():
     """Handle client disconnection"""
     print(f"Client disconnected: {request.sid}")
-    if request.sid in active_sessions:
-        del active_sessions[request.sid]
+    release_prefetcher(request.sid)
+    # Progress is kept for a reconnect with the resume token; scoring tasks keep running.
+    # A partial chunked upload is dropped (the client falls back to uploading the whole recording).
+    link = get_session_store().pop(_sid_key(request.sid))
+    if link:
+        dropped = {}
+        
+        def detach(session_data):
+            if session_data.get('sid') != request.sid:
+                return False  # Another connection already took the session over
+            dropped['spool'] = session_data.pop('spool', None)
+            session_data['sid'] = None
+        
+        _update_session(link['application_id'], detach)
+        _discard_spool_files(link['application_id'], dropped.get('spool'))
 
 @socketio.on('start_interview', namespace='/interview')
 def handle_start_interview(data):
-    """Initialize interview session"""
+    """Initialize interview session, or resume it when a valid resume token is sent"""
     application_id = data.get('application_id')
     
     if not application_id:
@@ -40,6 +68,14 @@ def handle_start_interview(data):
         emit('error', {'message': 'Application not found'})
         return
     
+    resume_token = data.get('resume_token')
+    if resume_token:
+        session_data = get_session_store().get(_session_key(application.id))
+        if session_data and hmac.compare_digest(str(session_data.get('resume_token', '')), str(resume_token)):
+            resume_interview(session_data, data)
+            return
+        # Expired or unknown token: fall through and start over
+    
     questions = Question.query.filter_by(job_id=application.job_id).order_by(Question.order_index).all()
     
     if not questions:
@@ -51,40 +87,97 @@ def handle_start_interview(data):
     random.shuffle(questions_list)
     
     # Store session data
-    active_sessions[request.sid] = {
-        'application_id': application_id,
+    session_data = {
+        'application_id': application.id,
+        'resume_token': secrets.token_urlsafe(32),
+        'sid': request.sid,
         'questions': [q.id for q in questions_list],
         'current_index': 0,
-        'answers': []
+        'answers': [],
+        'scoring_mode': 'batch' if batch_scoring_enabled(application.job) else 'live',
+        # Client can send/receive audio as binary attachments instead of base64
+        'binary_audio': bool(data.get('binary_audio'))
     }
+    get_session_store().save(_session_key(application.id), session_data)
+    get_session_store().save(_sid_key(request.sid), {'application_id': application.id})
+    emit('session_token', {'resume_token': session_data['resume_token']})
     
     # Join room for this application
-    join_room(f'interview_{application_id}')
+    join_room(_room(application.id))
     
     # Send first question
-    first_question = questions_list[0]
-    emit('question', {
-        'question_id': first_question.id,
-        'text': first_question.text,
-        'weightage': first_question.weightage,
-        'question_number': 1,
-        'total_questions': len(questions_list)
-    })
+    send_current_question(session_data)
+
+@socketio.on('answer_chunk', namespace='/interview')
+def handle_answer_chunk(data):
+    """Append a recorded chunk to the current answer's spool file (acked with the next expected seq)"""
+    session_data = _load_session()
+    if not session_data:
+        return {'ok': False, 'error': 'No active session'}
+    
+    application_id = session_data['application_id']
+    question_id = data.get('question_id')
+    seq = data.get('seq')
+    current_index = session_data['current_index']
+    
+    if current_index >= len(session_data['questions']) or session_data['questions'][current_index] != question_id:
+        return {'ok': False, 'error': 'Question mismatch'}
+    if not isinstance(seq, int) or not data.get('audio_data'):
+        return {'ok': False, 'error': 'Chunk sequence number and audio required'}
+    
+    spool = session_data.get('spool')
+    if seq == 0:
+        # A new recording replaces any partial upload for this question
+        discard_audio_spool(application_id, question_id)
+        spool = {
+            'question_id': question_id,
+            'next_seq': 0,
+            'size': 0,
+            'chunk_seconds': _chunk_seconds(data.get('chunk_ms'))
+        }
+        if not _update_session(application_id, lambda data: data.__setitem__('spool', spool), owner=True):
+            return {'ok': False, 'error': 'No active session'}
+        start_transcriber(application_id, question_id)
+    elif not spool or spool['question_id'] != question_id:
+        return {'ok': False, 'error': 'Upload not started', 'next_seq': 0}
+    
+    if seq < spool['next_seq']:
+        # Duplicate delivery of a chunk we already have
+        return {'ok': True, 'next_seq': spool['next_seq']}
+    if seq > spool['next_seq']:
+        return {'ok': False, 'error': 'Chunk out of order', 'next_seq': spool['next_seq']}
     
-    # Generate and send speech for the question
     try:
-        audio_content = generate_speech(first_question.text)
-        if audio_content:
-            audio_base64 = base64.b64encode(audio_content).decode('utf-8')
-            emit('speech_generated', {'audio_data': audio_base64})
-    except Exception as e:
-        print(f"Error generating speech for question: {e}")
+        size = append_audio_chunk(application_id, question_id, data['audio_data'], spool['size'])
+    except AudioSpoolError as e:
+        return {'ok': False, 'error': str(e), 'next_seq': spool['next_seq']}
+    
+    def record_chunk(session_data):
+        current = session_data.get('spool')
+        if not current or current['question_id'] != question_id or current['next_seq'] != seq:
+            return False
+        current['size'] = size
+        current['next_seq'] = seq + 1
+    
+    updated = _update_session(application_id, record_chunk, owner=True)
+    spool = (updated or {}).get('spool')
+    if not spool or spool['question_id'] != question_id or spool['next_seq'] != seq + 1:
+        # A concurrent chunk or a new recording changed the upload; the client sends the whole recording
+        return {'ok': False, 'error': 'Upload state changed', 'next_seq': spool['next_seq'] if spool else 0}
+    
+    # Transcribe completed segments while the candidate keeps talking
+    transcriber = get_transcriber(application_id, question_id)
+    if transcriber:
+        # Only audio that is already in the spool counts, however late the chunks arrived
+        transcriber.on_progress(spool['next_seq'] * spool.get('chunk_seconds', _chunk_seconds(None)))
+    
+    return {'ok': True, 'next_seq': spool['next_seq']}
 
 @socketio.on('answer_submitted', namespace='/interview')
 def handle_answer_submitted(data):
     """Process submitted answer"""
     print(f"[DEBUG] Answer submitted - data: {data.keys() if data else 'None'}")
-    session_data = active_sessions.get(request.sid)
+    session_data = _load_session()
     
     if not session_data:
         print(f"[DEBUG] No active session for sid: {request.sid}")
@@ -93,9 +186,10 @@ def handle_answer_submitted(data):
     
     application_id = session_data['application_id']
     question_id = data.get('question_id')
-    audio_data = data.get('audio_data')  # Base64 encoded audio
+    audio_data = data.get('audio_data')  # Binary attachment or base64 encoded audio
     answer_text = data.get('answer_text', '')
     duration = data.get('duration')  # Duration in seconds
+    chunk_count = data.get('chunks')  # Set when the audio was streamed via answer_chunk
     
     print(f"[DEBUG] Processing answer - app_id: {application_id}, question_id: {question_id}")
     
@@ -126,99 +220,98 @@ def handle_answer_submitted(data):
     
     print(f"[DEBUG] No duplicate found, proceeding with answer processing")
     
-    # Save audio file if provided
-    audio_path = None
-    if audio_data:
-        audio_path = save_audio_file(audio_data, application_id, question_id)
-        
-        # Transcribe audio if no text provided
-        if not answer_text and audio_path:
-            try:
-                answer_text = transcribe_audio(audio_path)
-                # Emit transcribed text back to client
-                emit('transcript_received', {
-                    'question_id': question_id,
-                    'transcript': answer_text
-                })
-            except Exception as e:
-                print(f"Error transcribing audio: {e}")
-                answer_text = "[Transcription failed]"
-                emit('transcript_received', {
-                    'question_id': question_id,
-                    'transcript': answer_text
-                })
-    
-    # Validate that we have answer text (either from transcription or typed)
-    if not answer_text or answer_text == "[Transcription failed]":
-        # If no valid answer text, use a default
-        answer_text = "[No answer provided]"
-    
     # Get question
     question = Question.query.get(question_id)
     if not question:
         emit('error', {'message': 'Question not found'})
         return
     
-    # Evaluate answer using AI
-    try:
-        score = evaluate_answer(question.text, answer_text, question.weightage)
-    except Exception as e:
-        print(f"Error evaluating answer: {e}")
-        score = question.weightage * 0.5  # Default to 50%
+    # Save audio file if provided (inline, or the chunks spooled during recording)
+    # Transcription starts on the uploaded bytes while compression runs; both join before scoring
+    audio_path = None
+    if audio_data:
+        _discard_spool(application_id)
+        try:
+            audio_bytes = decode_audio_data(audio_data)
+        except (TypeError, ValueError) as e:  # binascii.Error is a ValueError
+            print(f"Invalid audio payload for question {question_id}: {e}")
+            discard_transcriber(application_id, question_id)
+            emit('error', {'message': 'Invalid audio data. Please record your answer again.'})
+            return
+        if not answer_text:
+            start_upload_transcription(application_id, question_id, audio_bytes)
+        try:
+            audio_path = save_audio_file(audio_bytes, application_id, question_id)
+        except AudioPoolSaturated as e:
+            discard_transcriber(application_id, question_id)
+            _emit_server_busy(question_id, e.retry_after)
+            return
+    elif chunk_count:
+        spool = session_data.get('spool')
+        if not spool or spool['question_id'] != question_id or spool['next_seq'] != chunk_count:
+            received = spool['next_seq'] if spool and spool['question_id'] == question_id else 0
+            emit('upload_incomplete', {'question_id': question_id, 'received': received})
+            return
+        transcriber = get_transcriber(application_id, question_id)
+        if transcriber and not answer_text:
+            transcriber.start_finish(get_spool_path(application_id, question_id))
+        try:
+            audio_path = save_spooled_audio(application_id, question_id)
+        except AudioPoolSaturated as e:
+            # The spool and segment transcripts stay in place for the retry
+            if transcriber:
+                transcriber.cancel_finish()
+            _emit_server_busy(question_id, e.retry_after)
+            return
+    else:
+        _discard_spool(application_id)
+    
+    if not audio_path and not answer_text:
+        answer_text = NO_ANSWER_TEXT
     
-    # Save answer to database
+    # Store the answer first; transcription and scoring fill it in
     answer = Answer(
         application_id=application_id,
         question_id=question_id,
-        answer_text=answer_text,
+        answer_text=answer_text or None,
         audio_path=audio_path,
-        score=score,
+        score=0.0,
+        score_status='pending',
         weightage=question.weightage,
         duration=duration
     )
     
     db.session.add(answer)
-    
-    # Update application score
-    application = Application.query.get(application_id)
-    application.total_score += score
-    
     db.session.commit()
     
-    # Store answer in session
-    session_data['answers'].append({
+    # Store answer in session and move to the next question (the spool was consumed by the save)
+    session_data = _advance_session(session_data, current_index, question_id, {
+        'answer_id': answer.id,
         'question': question.text,
-        'answer': answer_text,
-        'score': score
+        'answer': answer.answer_text,
+        'score': None
     })
-    
-    # Move to next question
-    session_data['current_index'] += 1
+    if session_data is None:
+        # A resent submission for this question got there first (or the session expired)
+        db.session.delete(answer)
+        db.session.commit()
+        _emit_if_session_gone(application_id)
+        return
     current_index = session_data['current_index']
     print(f"[DEBUG] Answer processed successfully. Moving to index: {current_index}")
     
+    if session_data.get('scoring_mode') == 'batch':
+        # Only transcription runs now; all answers are scored in one call at finalization
+        schedule_answer_transcription(answer, _room(application_id))
+    elif deferred_scoring_enabled():
+        # Next question goes out now; the score is reconciled before finalization
+        schedule_answer_scoring(answer, _room(application_id))
+    else:
+        score_answer(answer.id, _room(application_id))  # Picked up by _refresh_session_answers at finalization
+    
     if current_index < len(session_data['questions']):
-        # Send next question
-        next_question_id = session_data['questions'][current_index]
-        next_question = Question.query.get(next_question_id)
-        
-        print(f"[DEBUG] Sending next question - number: {current_index + 1}, id: {next_question.id}")
-        emit('question', {
-            'question_id': next_question.id,
-            'text': next_question.text,
-            'weightage': next_question.weightage,
-            'question_number': current_index + 1,
-            'total_questions': len(session_data['questions'])
-        })
-        
-        # Generate and send speech for the question
-        try:
-            audio_content = generate_speech(next_question.text)
-            if audio_content:
-                audio_base64 = base64.b64encode(audio_content).decode('utf-8')
-                emit('speech_generated', {'audio_data': audio_base64})
-        except Exception as e:
-            print(f"Error generating speech for question: {e}")
+        print(f"[DEBUG] Sending next question - number: {current_index + 1}")
+        send_current_question(session_data)
     else:
         application = Application.query.get(application_id)
         finalize_interview(application, session_data)
@@ -226,7 +319,7 @@ def handle_answer_submitted(data):
 @socketio.on('skip_question', namespace='/interview')
 def handle_skip_question(data):
     """Handle skipping the current question"""
-    session_data = active_sessions.get(request.sid)
+    session_data = _load_session()
     
     if not session_data:
         emit('error', {'message': 'No active session'})
@@ -264,6 +357,8 @@ def handle_skip_question(data):
         emit('error', {'message': 'Question not found'})
         return
     
+    _discard_spool(application_id)
+    
     # Record skipped answer
     skipped_text = "Answer skipped by Candidate"
     answer = Answer(
@@ -272,6 +367,7 @@ def handle_skip_question(data):
         answer_text=skipped_text,
         audio_path=None,
         score=0.0,
+        score_tier='skipped',
         weightage=question.weightage,
         duration=0.0
     )
@@ -279,36 +375,22 @@ def handle_skip_question(data):
     db.session.add(answer)
     db.session.commit()
     
-    # Track in session data
-    session_data['answers'].append({
+    # Track in session data and move to next question
+    session_data = _advance_session(session_data, current_index, question_id, {
+        'answer_id': answer.id,
         'question': question.text,
         'answer': skipped_text,
         'score': 0.0
     })
-    
-    # Move to next question
-    session_data['current_index'] += 1
+    if session_data is None:
+        db.session.delete(answer)
+        db.session.commit()
+        _emit_if_session_gone(application_id)
+        return
     current_index = session_data['current_index']
     
     if current_index < len(session_data['questions']):
-        next_question_id = session_data['questions'][current_index]
-        next_question = Question.query.get(next_question_id)
-        
-        emit('question', {
-            'question_id': next_question.id,
-            'text': next_question.text,
-            'weightage': next_question.weightage,
-            'question_number': current_index + 1,
-            'total_questions': len(session_data['questions'])
-        })
-        
-        try:
-            audio_content = generate_speech(next_question.text)
-            if audio_content:
-                audio_base64 = base64.b64encode(audio_content).decode('utf-8')
-                emit('speech_generated', {'audio_data': audio_base64})
-        except Exception as e:
-            print(f"Error generating speech for question: {e}")
+        send_current_question(session_data)
     else:
         application = Application.query.get(application_id)
         finalize_interview(application, session_data)
@@ -322,18 +404,10 @@ def handle_request_speech(data):
         emit('error', {'message': 'Text required'})
         return
     
-    try:
-        audio_content = generate_speech(text)
-        if audio_content:
-            # Convert to base64 for transmission
-            import base64
-            audio_base64 = base64.b64encode(audio_content).decode('utf-8')
-            emit('speech_generated', {'audio_data': audio_base64})
-        else:
-            emit('error', {'message': 'Failed to generate speech'})
-    except Exception as e:
-        print(f"Error generating speech: {e}")
-        emit('error', {'message': 'Speech generation failed'})
+    session_data = _load_session() or {}
+    binary = data.get('binary_audio', session_data.get('binary_audio', False))
+    if not emit_speech(text, binary=binary):
+        emit('error', {'message': 'Failed to generate speech'})
 
 @socketio.on('ping', namespace='/interview')
 def handle_ping():
@@ -341,12 +415,136 @@ def handle_ping():
     emit('pong', {'timestamp': datetime.now().isoformat()})
 
 
+def resume_interview(session_data, data):
+    """Attach this connection to a stored session and continue at its current question"""
+    previous = {}
+    
+    def attach(stored):
+        previous['sid'] = stored.get('sid')
+        stored['sid'] = request.sid
+        if 'binary_audio' in data:
+            stored['binary_audio'] = bool(data.get('binary_audio'))
+    
+    session_data = _update_session(session_data['application_id'], attach)
+    if session_data is None:
+        emit('error', {'message': 'Interview session expired. Please refresh the page.'})
+        return
+    previous_sid = previous.get('sid')
+    if previous_sid and previous_sid != request.sid:
+        # Only one connection drives an interview; the older one is detached
+        get_session_store().pop(_sid_key(previous_sid))
+        release_prefetcher(previous_sid)
+        leave_room(_room(session_data['application_id']), sid=previous_sid, namespace='/interview')
+    get_session_store().save(_sid_key(request.sid), {'application_id': session_data['application_id']})
+    join_room(_room(session_data['application_id']))
+    
+    questions = session_data['questions']
+    current_index = session_data['current_index']
+    print(f"Resuming interview for application {session_data['application_id']} at question {current_index + 1}")
+    # question_id lets the client resend an answer to this question that got no reply
+    emit('interview_resumed', {
+        'question_id': questions[current_index] if current_index < len(questions) else None,
+        'question_number': current_index + 1,
+        'total_questions': len(questions),
+        'answered': len(session_data['answers'])
+    })
+    
+    if current_index >= len(questions):
+        # Every answer is stored; only finalization was interrupted
+        application = Application.query.get(session_data['application_id'])
+        if application and application.status == 'completed':
+            emit('interview_complete', {
+                'message': COMPLETION_MESSAGE,
+                'total_score': application.total_score,
+                'total_weightage': application.total_weightage
+            })
+        else:
+            finalize_interview(application, session_data)
+    elif data.get('current_question_id') == questions[current_index]:
+        # The client still shows this question and its audio; only prefetch what follows
+        prefetcher = get_prefetcher(request.sid)
+        if prefetcher:
+            prefetcher.prefetch(questions[current_index + 1:])
+    else:
+        # Earlier answers keep their stored transcripts and scores; speech comes from the TTS cache
+        send_current_question(session_data)
+
+
+def send_current_question(session_data):
+    """
+    Emit the question at current_index and its speech, prefetching the ones after it.
+    Sent to the application's room: the handler may be running for a connection the
+    candidate has since replaced.
+    """
+    questions = session_data['questions']
+    current_index = session_data['current_index']
+    question = Question.query.get(questions[current_index])
+    room = _room(session_data['application_id'])
+    
+    emit('question', {
+        'question_id': question.id,
+        'text': question.text,
+        'weightage': question.weightage,
+        'question_number': current_index + 1,
+        'total_questions': len(questions)
+    }, to=room)
+    
+    # Prefetched audio belongs to the connection driving the session (none while it is detached)
+    prefetcher = get_prefetcher(session_data['sid']) if session_data.get('sid') else None
+    audio_content = None
+    if prefetcher:
+        audio_content = prefetcher.take(question.id, current_app.config.get('TTS_PREFETCH_WAIT', 10))
+        # Render upcoming questions while the candidate answers this one
+        prefetcher.prefetch(questions[current_index + 1:])
+    
+    emit_speech(question.text, audio_content, session_data.get('binary_audio', False), to=room)
+
+
+def encode_audio(audio_bytes, binary=False):
+    """Binary clients get raw bytes (sent as a Socket.IO attachment), older clients base64"""
+    if binary:
+        return audio_bytes
+    return base64.b64encode(audio_bytes).decode('utf-8')
+
+
+def emit_speech(text, audio_content=None, binary=False, to=None):
+    """Send question speech (to the caller unless to is given), streaming it chunk by chunk when TTS_STREAMING is on"""
+    try:
+        if audio_content is None and current_app.config.get('TTS_STREAMING', False):
+            chunk_size = current_app.config.get('TTS_STREAM_CHUNK_SIZE', 16384)
+            seq = 0
+            try:
+                for chunk in stream_speech(text, chunk_size):
+                    emit('speech_chunk', {
+                        'seq': seq,
+                        'audio_data': encode_audio(chunk, binary)
+                    }, to=to)
+                    seq += 1
+            finally:
+                emit('speech_end', {'chunks': seq}, to=to)
+            return seq > 0
+        
+        if audio_content is None:
+            audio_content = generate_speech(text)
+        if audio_content:
+            emit('speech_generated', {'audio_data': encode_audio(audio_content, binary)}, to=to)
+            return True
+    except Exception as e:
+        print(f"Error generating speech for question: {e}")
+    return False
+
+
 def finalize_interview(application, session_data):
     """Finalize interview, persist results, and notify candidate"""
     if not application:
         emit('error', {'message': 'Application not found'})
         return
     
+    room = _room(application.id)
+    # Join deferred scoring tasks (or batch-score the job's answers) so total_score is final
+    wait_for_scoring(application.id, sid=room, batch=batch_scoring_enabled(application.job))
+    _refresh_session_answers(session_data)
+    
     candidate = application.candidate
     candidate_summary = ""
     if candidate and getattr(candidate, 'cv_summary', None):
@@ -370,6 +568,7 @@ def finalize_interview(application, session_data):
     application.interview_transcript = transcript
     
     db.session.commit()
+    index_application(application.id)
     
     try:
         send_interview_completion_email(application)
@@ -377,11 +576,124 @@ def finalize_interview(application, session_data):
         print(f"Error sending interview completion email: {e}")
     
     emit('interview_complete', {
-        'message': 'Thank you for completing the interview! Our team will review your application and reach out if we move forward together.',
+        'message': COMPLETION_MESSAGE,
         'total_score': application.total_score,
         'total_weightage': application.total_weightage
+    }, to=room)
+    
+    close_room(room)
+    # The connection driving the session may not be the one that ran this handler
+    sid = session_data.get('sid')
+    if sid:
+        release_prefetcher(sid)
+        get_session_store().pop(_sid_key(sid))
+    get_session_store().pop(_session_key(application.id))
+
+
+def _emit_server_busy(question_id, retry_after):
+    """Ask the client to resubmit the answer once audio processing has capacity"""
+    print(f"Audio processing saturated, asking client to retry question {question_id} in {retry_after}s")
+    emit('server_busy', {
+        'question_id': question_id,
+        'retry_after': retry_after,
+        'message': 'The server is busy processing answers. Retrying shortly...'
     })
+
+
+def _room(application_id):
+    return f"interview_{application_id}"
+
+
+def _session_key(application_id):
+    return f"application:{application_id}"
+
+
+def _sid_key(sid):
+    return f"sid:{sid}"
+
+
+def _load_session():
+    """Session driven by this connection (None if there is none or another connection took it over)"""
+    store = get_session_store()
+    link = store.get(_sid_key(request.sid))
+    if not link:
+        return None
+    session_data = store.get(_session_key(link['application_id']))
+    if not session_data or session_data.get('sid') != request.sid:
+        return None
+    return session_data
+
+
+def _chunk_seconds(chunk_ms):
+    """Recording length of one answer_chunk (the client's MediaRecorder timeslice)"""
+    if isinstance(chunk_ms, (int, float)) and not isinstance(chunk_ms, bool) and 100 <= chunk_ms <= 60000:
+        return chunk_ms / 1000.0
+    return current_app.config.get('ANSWER_CHUNK_SECONDS', 1.0)
+
+
+def _update_session(application_id, mutate, owner=False):
+    """
+    Atomically apply mutate to the stored session (other workers may be writing it too).
+    With owner=True the change is skipped unless this connection still drives the session.
+    Returns the stored session, or None if it no longer exists.
+    """
+    def guarded(session_data):
+        if owner and session_data.get('sid') != request.sid:
+            return False
+        return mutate(session_data)
+    
+    updated = get_session_store().update(_session_key(application_id), guarded)
+    if updated is not None and owner and updated.get('sid') != request.sid:
+        return None
+    return updated
+
+
+def _advance_session(session_data, current_index, question_id, entry):
+    """Record an answer and move past its question; None if another handler already did"""
+    def advance(stored):
+        if stored['current_index'] != current_index:
+            return False
+        spool = stored.get('spool')
+        if spool and spool['question_id'] == question_id:
+            stored.pop('spool')
+        stored['answers'].append(entry)
+        stored['current_index'] = current_index + 1
+    
+    updated = _update_session(session_data['application_id'], advance)
+    if not updated or not any(item.get('answer_id') == entry['answer_id'] for item in updated['answers']):
+        return None
+    return updated
+
+
+def _emit_if_session_gone(application_id):
+    if get_session_store().get(_session_key(application_id)) is None:
+        emit('error', {'message': 'Interview session expired. Please refresh the page.'})
+
+
+def _discard_spool(application_id):
+    """Drop any partially uploaded recording for the session"""
+    dropped = {}
     
-    leave_room(f'interview_{application.id}')
-    if request.sid in active_sessions:
-        del active_sessions[request.sid]
+    def take(session_data):
+        if 'spool' not in session_data:
+            return False
+        dropped['spool'] = session_data.pop('spool')
+    
+    _update_session(application_id, take)
+    _discard_spool_files(application_id, dropped.get('spool'))
+
+
+def _discard_spool_files(application_id, spool):
+    if spool:
+        discard_audio_spool(application_id, spool['question_id'])
+        discard_transcriber(application_id, spool['question_id'])
+
+
+def _refresh_session_answers(session_data):
+    """Reload answer text and scores written by (deferred) scoring"""
+    for item in session_data['answers']:
+        answer_id = item.get('answer_id')
+        answer = Answer.query.get(answer_id) if answer_id else None
+        if answer:
+            item['answer'] = answer.answer_text
+            item['score'] = answer.score
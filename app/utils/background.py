@@ -0,0 +1,72 @@
+from flask import current_app
+from app import socketio
+
+
+class BackgroundTask:
+    """Handle for a function running in a Socket.IO background task"""
+
+    def __init__(self):
+        self._event = socketio.server.eio.create_event()
+        self._result = None
+        self._error = None
+        self._thread = None
+        self._callbacks = []
+        self.cancelled = False
+
+    def done(self):
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """Block (cooperatively) until the task finishes or timeout passes; returns done()"""
+        return bool(self._event.wait(timeout))
+
+    def add_done_callback(self, fn):
+        """Call fn(task) once the task finishes or is cancelled (at once if it already has)"""
+        if self.done():
+            fn(self)
+        else:
+            self._callbacks.append(fn)
+
+    def _finish(self):
+        if self._event.is_set():
+            return
+        self._event.set()
+        callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            fn(self)
+
+    def result(self, timeout=None):
+        """Wait for the task and return its result (re-raises its exception)"""
+        if not self._event.wait(timeout):
+            raise TimeoutError("Background task did not finish in time")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def cancel(self):
+        """Stop waiting on the task; kills the green thread when the async mode allows it"""
+        self.cancelled = True
+        greenlet = getattr(self._thread, 'g', None)
+        if greenlet is not None and hasattr(greenlet, 'kill') and not self.done():
+            greenlet.kill()
+        if not self.done():
+            self._error = RuntimeError("Background task cancelled")
+            self._finish()
+
+
+def run_in_background(fn, *args, **kwargs):
+    """Run fn inside an app context in a Socket.IO background task"""
+    app = current_app._get_current_object()
+    task = BackgroundTask()
+
+    def runner():
+        with app.app_context():
+            try:
+                task._result = fn(*args, **kwargs)
+            except Exception as e:
+                task._error = e
+            finally:
+                task._finish()
+
+    task._thread = socketio.start_background_task(runner)
+    return task
@@ -1,4 +1,6 @@
 import os
+import hashlib
+import uuid
 from werkzeug.utils import secure_filename
 from flask import current_app
 
@@ -33,6 +35,10 @@ def save_uploaded_file(file, subfolder):
         if not validate_file_size(file):
             return None, "File size exceeds limit"
         
+        if subfolder == 'cv':
+            path, _, error = save_fingerprinted_file(file, subfolder)
+            return path, error
+        
         filename = secure_filename(file.filename)
         # Add timestamp to avoid conflicts
         from datetime import datetime
@@ -46,3 +52,42 @@ def save_uploaded_file(file, subfolder):
     
     return None, "Invalid file type"
 
+def file_fingerprint(file):
+    """SHA-256 of an uploaded file's content (the stream is rewound afterwards)"""
+    digest = hashlib.sha256()
+    file.seek(0)
+    for block in iter(lambda: file.read(65536), b''):
+        digest.update(block)
+    file.seek(0)
+    return digest.hexdigest()
+
+def save_fingerprinted_file(file, subfolder):
+    """
+    Save an upload under its content hash so identical files are stored once.
+    Returns (path, sha256, error).
+    """
+    if not file or not file.filename:
+        return None, None, "Invalid file type"
+    
+    extension_group = current_app.config.get('ALLOWED_EXTENSIONS', [])
+    if subfolder == 'cv':
+        extension_group = current_app.config.get('ALLOWED_CV_EXTENSIONS', extension_group)
+    
+    if not allowed_file(file.filename, extension_group):
+        return None, None, "Invalid file type"
+    if not validate_file_size(file):
+        return None, None, "File size exceeds limit"
+    
+    digest = file_fingerprint(file)
+    # allowed_file has already checked the extension against the allow-list
+    extension = file.filename.rsplit('.', 1)[1].lower()
+    filename = f"{digest}.{extension}"
+    
+    filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], subfolder, filename)
+    if not os.path.exists(filepath):
+        # Write under a temporary name so a concurrent upload never sees a partial file
+        tmp_path = f"{filepath}.{uuid.uuid4().hex}.tmp"
+        file.save(tmp_path)
+        os.replace(tmp_path, filepath)
+    
+    return os.path.join('uploads', subfolder, filename), digest, None
@@ -7,6 +7,7 @@ Run this after creating the ai_prompts table in the database.
 
 from app import create_app, db
 from app.models import AIPrompt
+from app.services.prompt_registry import bump_prompt_version
 
 def init_prompts():
     """Initialize default AI prompts in the database"""
@@ -129,6 +130,33 @@ Return ONLY a valid JSON object with:
 {{
     "score": <number between 0 and {question_weightage}>,
     "feedback": "Brief feedback explaining the score"
+}}''',
+                'model': 'gpt-4o-mini',
+                'temperature': 0.3,
+                'is_active': True
+            },
+            {
+                'key': 'evaluate_answers_batch',
+                'name': 'Evaluate All Interview Answers (Batch)',
+                'description': 'Scores every answer of an interview in a single call for jobs using batch scoring. Receives numbered question/answer blocks with their maximum scores and returns one score per answer id.',
+                'category': 'Answer Evaluation',
+                'system_message': 'You are an expert HR interviewer with strong contextual understanding. You evaluate answers fairly based on question type and provide appropriate scores. You understand that simple questions deserve high scores for correct simple answers.',
+                'prompt_template': '''You are an expert HR interviewer evaluating all of a candidate's interview answers. Score each answer independently with fair, context-aware scoring.
+
+{answers_block}
+
+SCORING GUIDELINES:
+- Yes/No or simple factual questions: a short but CORRECT answer deserves 80-100% of its maximum score
+- Experience and behavioral questions need detail and examples; brief answers score 30-60%, detailed relevant answers 60-100%
+- Incorrect, contradictory or irrelevant answers score 0-40%
+- Focus on whether the answer is CORRECT and RELEVANT, not just length
+- Never exceed an answer's Maximum Score
+
+Return ONLY a valid JSON object with one entry for each of the {total_questions} answers, using the numbers in brackets as ids:
+{{
+    "scores": [
+        {{"id": <answer number>, "score": <number between 0 and that answer's Maximum Score>, "feedback": "Brief feedback"}}
+    ]
 }}''',
                 'model': 'gpt-4o-mini',
                 'temperature': 0.3,
@@ -180,6 +208,8 @@ Focus on:
                 added_count += 1
                 print(f"✓ Added prompt: {prompt_data['name']}")
         
+        # Let running workers reload their cached prompts
+        bump_prompt_version()
         db.session.commit()
         
         print(f"\n{'='*60}")
@@ -0,0 +1,26 @@
+"""add candidates.lexical_match_score
+
+Revision ID: 1d7a5e9c4f36
+Revises: 4b8e1d7a3c52
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1d7a5e9c4f36'
+down_revision = '4b8e1d7a3c52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('candidates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('lexical_match_score', sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('candidates', schema=None) as batch_op:
+        batch_op.drop_column('lexical_match_score')
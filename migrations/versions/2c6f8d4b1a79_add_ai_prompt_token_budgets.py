@@ -0,0 +1,26 @@
+"""add token_budgets to ai_prompts
+
+Revision ID: 2c6f8d4b1a79
+Revises: 7e3b9a1f6c85
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c6f8d4b1a79'
+down_revision = '7e3b9a1f6c85'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('ai_prompts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_budgets', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('ai_prompts', schema=None) as batch_op:
+        batch_op.drop_column('token_budgets')
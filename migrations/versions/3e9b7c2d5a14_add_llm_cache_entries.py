@@ -0,0 +1,38 @@
+"""add llm_cache_entries table
+
+Revision ID: 3e9b7c2d5a14
+Revises: 8c4f2a7e1b93
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e9b7c2d5a14'
+down_revision = '8c4f2a7e1b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('llm_cache_entries',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('function', sa.String(length=100), nullable=False),
+    sa.Column('value', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    with op.batch_alter_table('llm_cache_entries', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_llm_cache_entries_function'), ['function'], unique=False)
+        batch_op.create_index(batch_op.f('ix_llm_cache_entries_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('llm_cache_entries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_llm_cache_entries_expires_at'))
+        batch_op.drop_index(batch_op.f('ix_llm_cache_entries_function'))
+
+    op.drop_table('llm_cache_entries')
@@ -0,0 +1,26 @@
+"""add candidates.cv_analysis_status
+
+Revision ID: 4b8e1d7a3c52
+Revises: 9f1c3b6e2d48
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b8e1d7a3c52'
+down_revision = '9f1c3b6e2d48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('candidates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('cv_analysis_status', sa.String(length=20), nullable=True, server_default='completed'))
+
+
+def downgrade():
+    with op.batch_alter_table('candidates', schema=None) as batch_op:
+        batch_op.drop_column('cv_analysis_status')
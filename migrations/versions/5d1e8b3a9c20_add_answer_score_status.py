@@ -0,0 +1,26 @@
+"""add answers.score_status
+
+Revision ID: 5d1e8b3a9c20
+Revises: 2f6a9c1e4b7d
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1e8b3a9c20'
+down_revision = '2f6a9c1e4b7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('score_status', sa.String(length=20), nullable=True, server_default='scored'))
+
+
+def downgrade():
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.drop_column('score_status')
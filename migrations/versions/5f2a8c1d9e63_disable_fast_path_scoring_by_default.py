@@ -0,0 +1,28 @@
+"""turn jobs.fast_path_scoring off by default (opt-in per job)
+
+Revision ID: 5f2a8c1d9e63
+Revises: 2c6f8d4b1a79
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f2a8c1d9e63'
+down_revision = '2c6f8d4b1a79'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.alter_column('fast_path_scoring', existing_type=sa.Boolean(), server_default=sa.false())
+
+    op.execute(sa.text("UPDATE jobs SET fast_path_scoring = :off").bindparams(off=False))
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.alter_column('fast_path_scoring', existing_type=sa.Boolean(), server_default=sa.true())
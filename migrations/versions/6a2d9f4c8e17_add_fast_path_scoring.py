@@ -0,0 +1,32 @@
+"""add jobs.fast_path_scoring and answers.score_tier
+
+Revision ID: 6a2d9f4c8e17
+Revises: 3e9b7c2d5a14
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a2d9f4c8e17'
+down_revision = '3e9b7c2d5a14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('fast_path_scoring', sa.Boolean(), nullable=True, server_default=sa.true()))
+
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('score_tier', sa.String(length=20), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.drop_column('score_tier')
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_column('fast_path_scoring')
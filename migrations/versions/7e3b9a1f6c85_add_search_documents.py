@@ -0,0 +1,49 @@
+"""add search_documents table with a full-text index
+
+Revision ID: 7e3b9a1f6c85
+Revises: 1d7a5e9c4f36
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e3b9a1f6c85'
+down_revision = '1d7a5e9c4f36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('search_documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('application_id')
+    )
+    with op.batch_alter_table('search_documents', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_search_documents_organization_id'), ['organization_id'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Expression must match search_service._search_postgres for the planner to use it
+        op.execute(
+            "CREATE INDEX ix_search_documents_fts ON search_documents "
+            "USING gin (to_tsvector('english', content))"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_search_documents_fts")
+
+    with op.batch_alter_table('search_documents', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_search_documents_organization_id'))
+
+    op.drop_table('search_documents')
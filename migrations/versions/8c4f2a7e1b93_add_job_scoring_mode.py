@@ -0,0 +1,26 @@
+"""add jobs.scoring_mode
+
+Revision ID: 8c4f2a7e1b93
+Revises: 5d1e8b3a9c20
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4f2a7e1b93'
+down_revision = '5d1e8b3a9c20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('scoring_mode', sa.String(length=20), nullable=True, server_default='live'))
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_column('scoring_mode')
@@ -0,0 +1,30 @@
+"""add candidates.cv_hash and candidates.cv_text
+
+Revision ID: 9f1c3b6e2d48
+Revises: 6a2d9f4c8e17
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f1c3b6e2d48'
+down_revision = '6a2d9f4c8e17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('candidates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('cv_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('cv_text', sa.Text(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_candidates_cv_hash'), ['cv_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('candidates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_candidates_cv_hash'))
+        batch_op.drop_column('cv_text')
+        batch_op.drop_column('cv_hash')
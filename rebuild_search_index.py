@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Rebuild Candidate Search Index
+Indexes every existing application for the org-admin candidate search.
+New answers, CV analyses and completed interviews are indexed automatically;
+run this once after applying the search_documents migration.
+"""
+
+from app import create_app
+from app.services.search_service import rebuild_search_index
+
+def rebuild_index():
+    """Rebuild search documents for all applications"""
+    app = create_app()
+    
+    with app.app_context():
+        count = rebuild_search_index()
+        print(f"✅ Indexed {count} applications")
+
+if __name__ == '__main__':
+    rebuild_index()
@@ -0,0 +1,48 @@
+import sys
+import pytest
+from app import create_app, db
+from app.config import Config
+
+
+@pytest.fixture
+def app(tmp_path):
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = 'sqlite://'
+        UPLOAD_FOLDER = str(tmp_path / 'uploads')
+        AUDIO_POOL_WORKERS = 0
+        SESSION_STORE_URL = 'memory://'
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+# Stands in for ffmpeg: copies its input and holds as many MB as the input has bytes;
+# input starting with b'slow' hangs after writing, b'bad' fails
+FAKE_FFMPEG = """#!{python}
+import sys
+import time
+args = sys.argv[1:]
+data = sys.stdin.buffer.read() if 'pipe:0' in args else open(args[args.index('-i') + 1], 'rb').read()
+if data.startswith(b'slow'):
+    open(args[-1], 'wb').write(data)
+    time.sleep(30)
+if data.startswith(b'bad'):
+    sys.stderr.write('Invalid data found when processing input')
+    sys.exit(1)
+held = bytearray(len(data) * 1024 * 1024)
+with open(args[-1], 'wb') as f:
+    f.write(data)
+"""
+
+
+@pytest.fixture
+def ffmpeg(tmp_path):
+    path = tmp_path / 'ffmpeg'
+    path.write_text(FAKE_FFMPEG.format(python=sys.executable))
+    path.chmod(0o755)
+    return str(path)
@@ -0,0 +1,24 @@
+import time
+import pytest
+from app.services.audio_pool import AudioPoolSaturated, AudioTranscodePool
+from app.services.voice_service import transcode_to_mp3
+
+
+def test_rejections_are_counted(app):
+    pool = AudioTranscodePool(workers=1, queue_size=0)
+    pool._slots.acquire()  # The only slot is taken
+    with pytest.raises(AudioPoolSaturated):
+        pool.run(transcode_to_mp3, 'unused.mp3')
+    assert pool.stats()['rejected'] == 1
+
+
+def test_timed_out_job_leaves_no_partial_output(app, tmp_path, ffmpeg):
+    pool = AudioTranscodePool(workers=1, queue_size=1)
+    output = tmp_path / 'answer.mp3'
+    try:
+        with pytest.raises(TimeoutError):
+            pool.run(transcode_to_mp3, str(output), input_bytes=b'slow', ffmpeg=ffmpeg,
+                     deadline=time.time() + 2, timeout=2)
+        assert list(tmp_path.glob('answer.mp3*')) == []
+    finally:
+        pool.shutdown()
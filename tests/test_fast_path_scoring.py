@@ -0,0 +1,25 @@
+import pytest
+from app.services.ai_service import fast_path_score
+
+
+@pytest.mark.parametrize('question, answer, rule', [
+    ('Are you willing to relocate?', 'Yes', 'yes_reply'),
+    ('Do you have a valid driving licence?', 'No', 'no_reply'),
+    ('Describe a project you are proud of.', 'Yes', 'too_short'),
+    ('Tell us about your last role', 'Engineer', 'too_short'),
+])
+def test_rules_that_apply(app, question, answer, rule):
+    result = fast_path_score(question, answer, 10)
+    assert result is not None and result[1] == rule
+
+
+@pytest.mark.parametrize('question, answer', [
+    ('Would you describe yourself as a team player?', 'Yes'),
+    ('Have you led a team before? Tell us how you handled conflicts.', 'Yes'),
+    ('Are you willing to relocate? If so, which cities would you consider?', 'Yes I am'),
+    ('Do you prefer remote or office work?', 'Remote'),
+    ('Can you explain your approach to testing?', 'Yes'),
+    ('How many years of Python experience do you have?', 'Five'),
+])
+def test_everything_else_goes_to_the_llm(app, question, answer):
+    assert fast_path_score(question, answer, 10) is None
@@ -0,0 +1,83 @@
+import pytest
+from app import db
+from app.models import Answer, Application, Candidate, Job, Organization, Question
+from app.services import scoring_service
+from app.services.scoring_service import score_answer, wait_for_scoring
+
+
+class RunningTask:
+    """Stands in for a background scoring task that has not finished"""
+
+    def result(self, timeout=None):
+        raise TimeoutError("Background task did not finish in time")
+
+    def done(self):
+        return False
+
+
+def _create_answers(count):
+    organization = Organization(name='Acme', email='hr@acme.test', slug='acme')
+    job = Job(title='Engineer', organization=organization)
+    candidate = Candidate(first_name='Ada', last_name='Lovelace', email='ada@example.test')
+    application = Application(candidate=candidate, job=job)
+    db.session.add(application)
+    answers = []
+    for index in range(count):
+        question = Question(text=f'Question {index}?', weightage=10, order_index=index, job=job)
+        answer = Answer(application=application, question=question, answer_text=f'Answer {index}',
+                        score=0.0, score_status='pending', weightage=10)
+        db.session.add(answer)
+        answers.append(answer)
+    db.session.commit()
+    return application.id, [answer.id for answer in answers]
+
+
+def _count_evaluations(monkeypatch):
+    calls = []
+
+    def evaluate(question_text, answer_text, question_weightage):
+        calls.append(answer_text)
+        return 7.0
+
+    monkeypatch.setattr(scoring_service, 'evaluate_answer', evaluate)
+    monkeypatch.setattr(scoring_service, 'index_application', lambda application_id: True)
+    return calls
+
+
+def test_score_answer_skips_an_answer_claimed_elsewhere(app, monkeypatch):
+    calls = _count_evaluations(monkeypatch)
+    _, (answer_id,) = _create_answers(1)
+    Answer.query.get(answer_id).score_status = 'scoring'
+    db.session.commit()
+
+    assert score_answer(answer_id) is None
+    assert calls == []
+
+
+def test_wait_for_scoring_leaves_running_and_claimed_answers_alone(app, monkeypatch):
+    calls = _count_evaluations(monkeypatch)
+    application_id, (running_id, claimed_id, pending_id) = _create_answers(3)
+    Answer.query.get(claimed_id).score_status = 'scoring'
+    db.session.commit()
+    scoring_service._pending_tasks[application_id] = {running_id: RunningTask()}
+
+    total = wait_for_scoring(application_id, timeout=0)
+
+    assert calls == ['Answer 2']
+    assert Answer.query.get(pending_id).score_status == 'scored'
+    assert Answer.query.get(running_id).score_status == 'pending'
+    assert Answer.query.get(claimed_id).score_status == 'scoring'
+    assert total == 7.0
+
+
+def test_failed_scoring_releases_the_claim(app, monkeypatch):
+    _count_evaluations(monkeypatch)
+    _, (answer_id,) = _create_answers(1)
+
+    def fail(application_id):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(scoring_service, 'reconcile_total_score', fail)
+    with pytest.raises(RuntimeError):
+        score_answer(answer_id)
+    assert Answer.query.get(answer_id).score_status == 'pending'
@@ -0,0 +1,43 @@
+from app import db
+from app.models import Application, Candidate, Job, Organization, SearchDocument
+from app.services.search_service import index_application
+
+
+def _create_application():
+    organization = Organization(name='Acme', email='hr@acme.test', slug='acme')
+    job = Job(title='Engineer', organization=organization)
+    candidate = Candidate(first_name='Ada', last_name='Lovelace', email='ada@example.test',
+                          cv_summary='Python and analytical engines')
+    application = Application(candidate=candidate, job=job)
+    db.session.add(application)
+    db.session.commit()
+    ids = application.id, organization.id
+    # Start from an empty session, as a new request or background task does
+    db.session.remove()
+    return ids
+
+
+def test_index_application_without_existing_document(app):
+    application_id, organization_id = _create_application()
+
+    assert index_application(application_id) is True
+
+    document = SearchDocument.query.filter_by(application_id=application_id).one()
+    assert document.organization_id == organization_id
+    assert 'Ada Lovelace' in document.content
+    assert 'analytical engines' in document.content
+
+
+def test_index_application_updates_existing_document(app):
+    application_id, _ = _create_application()
+    assert index_application(application_id) is True
+
+    application = Application.query.get(application_id)
+    application.personality_profile = 'Curious and methodical'
+    db.session.commit()
+    db.session.remove()
+
+    assert index_application(application_id) is True
+    documents = SearchDocument.query.filter_by(application_id=application_id).all()
+    assert len(documents) == 1
+    assert 'Curious and methodical' in documents[0].content
@@ -0,0 +1,30 @@
+import time
+import pytest
+from app.services.voice_service import transcode_to_mp3
+
+
+def test_peak_rss_is_measured_per_run(tmp_path, ffmpeg):
+    large = transcode_to_mp3(str(tmp_path / 'large.mp3'), input_bytes=b'x' * 200, ffmpeg=ffmpeg, measure_rss=True)
+    small = transcode_to_mp3(str(tmp_path / 'small.mp3'), input_bytes=b'x', ffmpeg=ffmpeg, measure_rss=True)
+
+    assert large['ffmpeg_peak_rss_kb'] > 200 * 1024
+    # A process-wide RUSAGE_CHILDREN maximum would still report the large run here
+    assert small['ffmpeg_peak_rss_kb'] < large['ffmpeg_peak_rss_kb']
+    assert small['output_bytes'] == 1
+
+
+def test_peak_rss_is_not_reported_inline(tmp_path, ffmpeg):
+    stats = transcode_to_mp3(str(tmp_path / 'out.mp3'), input_bytes=b'x', ffmpeg=ffmpeg)
+    assert stats['ffmpeg_peak_rss_kb'] is None
+
+
+def test_ffmpeg_errors_are_raised(tmp_path, ffmpeg):
+    with pytest.raises(RuntimeError, match='Invalid data'):
+        transcode_to_mp3(str(tmp_path / 'out.mp3'), input_bytes=b'bad', ffmpeg=ffmpeg, measure_rss=True)
+
+
+def test_ffmpeg_is_killed_at_the_deadline(tmp_path, ffmpeg):
+    output = tmp_path / 'out.mp3'
+    with pytest.raises(TimeoutError):
+        transcode_to_mp3(str(output), input_bytes=b'slow', ffmpeg=ffmpeg, deadline=time.time() + 0.5)
+    assert list(tmp_path.glob('out.mp3*')) == []